@@ -1,4 +1,4 @@
-from collections import deque
+from search import search
 
 # Validate a state
 def is_valid(state):
@@ -42,24 +42,8 @@ def get_successors(state):
 
 # BFS search
 def bfs(start_state, goal_state):
-    queue = deque()
-    queue.append((start_state, [start_state]))
-    visited = set()
-
-    while queue:
-        current_state, path = queue.popleft()
-
-        if current_state == goal_state:
-            return path
-
-        if current_state not in visited:
-            visited.add(current_state)
-
-            for successor in get_successors(current_state):
-                if successor not in visited:
-                    queue.append((successor, path + [successor]))
-
-    return None
+    path, stats = search(start_state, lambda s: s == goal_state, get_successors, mode="bfs")
+    return path
 
 
 if __name__ == "__main__":
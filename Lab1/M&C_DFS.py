@@ -1,3 +1,8 @@
+import argparse
+
+from search import compare_modes, search
+
+
 def is_valid(state):
     M_left, C_left, boat = state
     M_right = 3 - M_left
@@ -37,32 +42,35 @@ def get_successors(state):
     return successors
 
 
-def dfs_missionaries_cannibals(start_state, goal_state):
-    stack = [(start_state, [start_state])]
-    visited = set()
-
-    while stack:
-        current_state, path = stack.pop()
-
-        if current_state == goal_state:
-            return path
-
-        if current_state not in visited:
-            visited.add(current_state)
-
-            for successor in get_successors(current_state):
-                if successor not in visited:
-                    stack.append((successor, path + [successor]))
-
-    return "No solution found"
+def dfs_missionaries_cannibals(start_state, goal_state, mode="dfs", tt_size=None):
+    """
+    mode="dfs" is plain graph DFS; mode="iddfs" returns a shortest path
+    using iterative deepening with an optional LRU transposition table.
+    """
+    path, stats = search(start_state, lambda s: s == goal_state, get_successors,
+                         mode=mode, tt_size=tt_size)
+    if path is None:
+        return "No solution found"
+    return path
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Missionaries & Cannibals (DFS / IDDFS)")
+    parser.add_argument("--mode", choices=["dfs", "iddfs"], default="dfs")
+    parser.add_argument("--tt-size", type=int, default=None,
+                        help="Transposition table entries for iddfs (LRU eviction)")
+    parser.add_argument("--compare", action="store_true",
+                        help="Report nodes/sec and re-expansion overhead against BFS")
+    args = parser.parse_args()
+
     start = (3, 3, 0)  
     goal = (0, 0, 1)   
     
-    solution = dfs_missionaries_cannibals(start, goal)
+    solution = dfs_missionaries_cannibals(start, goal, args.mode, args.tt_size)
 
     print("Solution path:")
     print(solution)
 
+    if args.compare:
+        print()
+        compare_modes(start, lambda s: s == goal, get_successors, tt_size=args.tt_size)
@@ -1,26 +1,18 @@
-def rabbit_leap():
-    # Initial and goal states
-    initial_state = ('E', 'E', 'E', '_', 'W', 'W', 'W')
-    goal_state = ('W', 'W', 'W', '_', 'E', 'E', 'E')
+import argparse
 
-    # DFS stack and visited set
-    stack = [(initial_state, [initial_state])]  # store (state, path)
-    visited = set([initial_state])
+from search import compare_modes, search
 
-    while stack:
-        current_state, path = stack.pop()
+# Initial and goal states
+INITIAL_STATE = ('E', 'E', 'E', '_', 'W', 'W', 'W')
+GOAL_STATE = ('W', 'W', 'W', '_', 'E', 'E', 'E')
 
-        # Goal check
-        if current_state == goal_state:
-            return path
 
-        # Find valid moves
-        for new_state in generate_moves(current_state):
-            if new_state not in visited:
-                visited.add(new_state)
-                stack.append((new_state, path + [new_state]))
-
-    return None  # No solution found
+def rabbit_leap(mode="dfs", tt_size=None):
+    # DFS over the shared search kernel (predecessor map, no path copies);
+    # mode="iddfs" gives the shortest solution with bounded memory
+    path, stats = search(INITIAL_STATE, lambda s: s == GOAL_STATE, generate_moves,
+                         mode=mode, tt_size=tt_size)
+    return path  # None if no solution found
 
 
 def generate_moves(state):
@@ -54,10 +46,23 @@ def generate_moves(state):
     return moves
 
 
-solution = rabbit_leap()
-if solution:
-    print("Solution found in", len(solution)-1, "moves:")
-    for step in solution:
-        print("".join(step))
-else:
-    print("No solution found.")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rabbit Leap (DFS / IDDFS)")
+    parser.add_argument("--mode", choices=["dfs", "iddfs"], default="dfs")
+    parser.add_argument("--tt-size", type=int, default=None,
+                        help="Transposition table entries for iddfs (LRU eviction)")
+    parser.add_argument("--compare", action="store_true",
+                        help="Report nodes/sec and re-expansion overhead against BFS")
+    args = parser.parse_args()
+
+    solution = rabbit_leap(args.mode, args.tt_size)
+    if solution:
+        print("Solution found in", len(solution)-1, "moves:")
+        for step in solution:
+            print("".join(step))
+    else:
+        print("No solution found.")
+
+    if args.compare:
+        print()
+        compare_modes(INITIAL_STATE, lambda s: s == GOAL_STATE, generate_moves, tt_size=args.tt_size)
@@ -0,0 +1,127 @@
+import argparse
+import time
+from array import array
+from collections import deque
+
+
+# Generate every boat load (missionaries, cannibals) for a given capacity
+def boat_moves(capacity):
+    return [(m, c)
+            for m in range(capacity + 1)
+            for c in range(capacity + 1 - m)
+            if m + c >= 1]
+
+
+class MCProblem:
+    """
+    Missionaries & Cannibals with arbitrary counts and boat capacity.
+
+    A state (M_left, C_left, boat) is packed into one integer:
+        ((M_left * (C + 1)) + C_left) * 2 + boat
+    so the visited/parent bookkeeping is a flat array indexed by state.
+    """
+
+    def __init__(self, missionaries=3, cannibals=3, capacity=2):
+        if missionaries < 0 or cannibals < 0 or capacity < 1:
+            raise ValueError("counts must be non-negative and capacity at least 1")
+        self.M = missionaries
+        self.C = cannibals
+        self.capacity = capacity
+        self.moves = boat_moves(capacity)
+        self.size = (missionaries + 1) * (cannibals + 1) * 2
+
+        # Precompute the bank-safety test for every (M_left, C_left) pair
+        self.safe = bytearray((missionaries + 1) * (cannibals + 1))
+        for m in range(missionaries + 1):
+            for c in range(cannibals + 1):
+                m_r, c_r = missionaries - m, cannibals - c
+                ok = not (m > 0 and c > m) and not (m_r > 0 and c_r > m_r)
+                self.safe[m * (cannibals + 1) + c] = ok
+
+    def pack(self, state):
+        m, c, boat = state
+        return (m * (self.C + 1) + c) * 2 + boat
+
+    def unpack(self, code):
+        mc, boat = divmod(code, 2)
+        m, c = divmod(mc, self.C + 1)
+        return (m, c, boat)
+
+    def start(self):
+        return self.pack((self.M, self.C, 0))
+
+    def goal(self):
+        return self.pack((0, 0, 1))
+
+    def successors(self, code):
+        """Yield packed successor states of a packed state."""
+        mc, boat = divmod(code, 2)
+        m, c = divmod(mc, self.C + 1)
+        width = self.C + 1
+        safe = self.safe
+        if boat == 0:
+            # Boat on LEFT -> carry people to the right bank
+            for dm, dc in self.moves:
+                nm, nc = m - dm, c - dc
+                if nm >= 0 and nc >= 0 and safe[nm * width + nc]:
+                    yield (nm * width + nc) * 2 + 1
+        else:
+            # Boat on RIGHT -> carry people back to the left bank
+            for dm, dc in self.moves:
+                nm, nc = m + dm, c + dc
+                if nm <= self.M and nc <= self.C and safe[nm * width + nc]:
+                    yield (nm * width + nc) * 2
+
+
+# BFS over packed states with a parent-pointer table
+def solve(problem):
+    """
+    Breadth-first search from the start to the goal state.
+    Returns (path, expanded) where path is a list of (M_left, C_left, boat)
+    tuples, or None if the goal is unreachable.
+    """
+    start, goal = problem.start(), problem.goal()
+    parent = array('i', [-1]) * problem.size
+    parent[start] = start
+    queue = deque([start])
+    expanded = 0
+
+    while queue:
+        code = queue.popleft()
+        if code == goal:
+            path = [code]
+            while code != start:
+                code = parent[code]
+                path.append(code)
+            return [problem.unpack(s) for s in reversed(path)], expanded
+
+        expanded += 1
+        for nxt in problem.successors(code):
+            if parent[nxt] < 0:
+                parent[nxt] = code
+                queue.append(nxt)
+
+    return None, expanded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generalized Missionaries & Cannibals (BFS)")
+    parser.add_argument("--m", type=int, default=3, help="Number of missionaries")
+    parser.add_argument("--c", type=int, default=3, help="Number of cannibals")
+    parser.add_argument("--cap", type=int, default=2, help="Boat capacity")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    args = parser.parse_args()
+
+    problem = MCProblem(args.m, args.c, args.cap)
+    start_time = time.perf_counter()
+    solution, expanded = solve(problem)
+    elapsed = time.perf_counter() - start_time
+
+    if solution:
+        print("Solution found in", len(solution) - 1, "crossings:")
+        if not args.quiet:
+            for step in solution:
+                print(step)
+    else:
+        print("No solution found")
+    print(f"States expanded: {expanded} | Time: {elapsed:.4f}s")
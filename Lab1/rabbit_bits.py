@@ -0,0 +1,173 @@
+"""
+Generalized Rabbit Leap with N rabbits per side on a bit-packed board.
+
+Each of the 2N+1 cells takes two bits (0 = empty, 1 = E, 2 = W) and the
+blank position is kept in the low bits of the same integer:
+
+    state = (board << BLANK_BITS) | blank
+
+so a move is two XORs on the board plus a new blank index, and states
+are plain ints for the shared search kernel.
+
+Successors that contain one of the deadlock patterns EEWW, EWWE, EWW_,
+WEEW or _EEW are pruned: none of them occurs in a state from which the
+goal is still reachable, and dropping them keeps the searched space
+quadratic in N instead of exponential.
+"""
+import argparse
+import time
+import tracemalloc
+
+from search import search
+
+EMPTY, EAST, WEST = 0, 1, 2
+SYMBOLS = {EMPTY: '_', EAST: 'E', WEST: 'W'}
+
+
+class RabbitBoard:
+    def __init__(self, n):
+        if n < 1:
+            raise ValueError("need at least one rabbit per side")
+        self.n = n
+        self.cells = 2 * n + 1
+        self.blank_bits = self.cells.bit_length()
+        self.blank_mask = (1 << self.blank_bits) - 1
+        # 1 in the low bit of every 2-bit cell, used to split the board by type
+        self.cell_mask = int('01' * self.cells, 2)
+
+    def is_dead(self, board):
+        """True if the board contains a deadlock pattern (checked for all offsets at once)."""
+        lo = board & self.cell_mask
+        hi = (board >> 1) & self.cell_mask
+        e = lo & ~hi
+        w = hi & ~lo
+        blank = self.cell_mask & ~(lo | hi)
+        # x >> 2k lines up cell i+k with cell i
+        e1, w1, w2 = e >> 2, w >> 2, w >> 4
+        return bool((e & e1 & w2 & (w >> 6))            # EEWW
+                    | (e & w1 & w2 & (e >> 6))          # EWWE
+                    | (e & w1 & w2 & (blank >> 6))      # EWW_
+                    | (w & e1 & (e >> 4) & (w >> 6))    # WEEW
+                    | (blank & e1 & (e >> 4) & (w >> 6)))  # _EEW
+
+    def pack(self, board, blank):
+        return (board << self.blank_bits) | blank
+
+    def encode(self, row):
+        """Encode a string/tuple such as 'EEE_WWW' into a packed state."""
+        codes = {'_': EMPTY, 'E': EAST, 'W': WEST}
+        board = 0
+        for i, ch in enumerate(row):
+            board |= codes[ch] << (2 * i)
+        return self.pack(board, list(row).index('_'))
+
+    def decode(self, state):
+        board = state >> self.blank_bits
+        return "".join(SYMBOLS[(board >> (2 * i)) & 3] for i in range(self.cells))
+
+    def start(self):
+        return self.encode('E' * self.n + '_' + 'W' * self.n)
+
+    def goal(self):
+        return self.encode('W' * self.n + '_' + 'E' * self.n)
+
+    def successors(self, state, prune=True):
+        """E rabbits move right, W rabbits move left, by a step or a jump over one rabbit."""
+        b = state & self.blank_mask
+        board = state >> self.blank_bits
+        bits = self.blank_bits
+        moves = []
+        # E rabbit at b-1 (step) or b-2 (jump) moves into the blank
+        for src in (b - 1, b - 2):
+            if src >= 0 and (board >> (2 * src)) & 3 == EAST:
+                new_board = board ^ (EAST << (2 * src)) ^ (EAST << (2 * b))
+                if not (prune and self.is_dead(new_board)):
+                    moves.append((new_board << bits) | src)
+        # W rabbit at b+1 (step) or b+2 (jump) moves into the blank
+        for src in (b + 1, b + 2):
+            if src < self.cells and (board >> (2 * src)) & 3 == WEST:
+                new_board = board ^ (WEST << (2 * src)) ^ (WEST << (2 * b))
+                if not (prune and self.is_dead(new_board)):
+                    moves.append((new_board << bits) | src)
+        return moves
+
+
+# ---------------- Constructive solver ----------------
+def constructive(rb):
+    """
+    Build the optimal N*(N+2)-move solution directly.
+
+    Moves come in runs of one rabbit type with lengths 1, 2, .., N-1,
+    N, N, N, N-1, .., 1, alternating E/W; each move jumps over an opposite
+    rabbit when it can and steps otherwise. O(1) per move.
+    """
+    n = rb.n
+    runs = list(range(1, n)) + [n, n, n] + list(range(n - 1, 0, -1))
+    state = rb.start()
+    path = [state]
+    kind = EAST
+    for run in runs:
+        for _ in range(run):
+            b = state & rb.blank_mask
+            board = state >> rb.blank_bits
+            if kind == EAST:
+                jump, step, over = b - 2, b - 1, b - 1
+            else:
+                jump, step, over = b + 2, b + 1, b + 1
+            if (0 <= jump < rb.cells and (board >> (2 * jump)) & 3 == kind
+                    and (board >> (2 * over)) & 3 == (EAST + WEST - kind)):
+                src = jump
+            else:
+                src = step
+            board ^= (kind << (2 * src)) ^ (kind << (2 * b))
+            state = rb.pack(board, src)
+            path.append(state)
+        kind = EAST + WEST - kind
+    return path
+
+
+def solve(n, method="constructive", prune=True):
+    """Return (path of packed states, stats) for N rabbits per side."""
+    rb = RabbitBoard(n)
+    if method == "constructive":
+        path = constructive(rb)
+        return path, {'expanded': len(path) - 1}
+    goal = rb.goal()
+    return search(rb.start(), lambda s: s == goal,
+                  lambda s: rb.successors(s, prune), mode=method)
+
+
+# ---------------- Benchmark ----------------
+def benchmark(sizes, methods, prune=True):
+    print(f"{'N':<4} {'Method':<13} {'Moves':<7} {'Expanded':<10} {'Time (s)':<10} {'Peak MB'}")
+    print("-" * 56)
+    for n in sizes:
+        for method in methods:
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            path, stats = solve(n, method, prune)
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            moves = len(path) - 1 if path else None
+            print(f"{n:<4} {method:<13} {str(moves):<7} {stats['expanded']:<10} "
+                  f"{elapsed:<10.4f} {peak / 1024 / 1024:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bit-packed Rabbit Leap for N rabbits per side")
+    parser.add_argument("--n", type=int, nargs="+", default=[3, 5, 10, 15, 20],
+                        help="Rabbits per side (one benchmark row group per value)")
+    parser.add_argument("--methods", type=str, default="bfs,dfs,constructive",
+                        help="comma-separated: bfs, dfs, iddfs, constructive")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="Search the full state space (no deadlock pruning)")
+    parser.add_argument("--show", action="store_true", help="Print the constructive solution boards")
+    args = parser.parse_args()
+
+    benchmark(args.n, [m.strip() for m in args.methods.split(",") if m.strip()],
+              prune=not args.no_prune)
+    if args.show:
+        rb = RabbitBoard(args.n[0])
+        for state in constructive(rb):
+            print(rb.decode(state))
@@ -0,0 +1,248 @@
+"""
+Shared uninformed search kernel for the Lab1 puzzles.
+
+Every mode keeps one predecessor map (state -> parent) instead of pushing
+`path + [state]` onto the frontier, so each generated state costs a single
+map entry and the path is rebuilt only once the goal is reached.
+
+    path, stats = search(start, is_goal, successors, mode="bfs")
+
+`stats` counts expansions, frontier pushes, allocations (frontier slots
+plus predecessor entries, or list elements copied for the path-copy
+baseline) and the peak frontier size.
+
+Iterative deepening returns shortest paths and can use a bounded
+transposition table (`tt_size`) with LRU eviction, so its memory stays
+at O(depth + tt_size) regardless of how many states exist.
+"""
+import argparse
+import importlib
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+
+
+def _new_stats():
+    return {'expanded': 0, 'generated': 0, 'allocations': 0, 'peak_frontier': 0}
+
+
+def _rebuild_path(parent, state):
+    path = [state]
+    while parent[state] is not None:
+        state = parent[state]
+        path.append(state)
+    path.reverse()
+    return path
+
+
+# ---------------- BFS / DFS with a predecessor map ----------------
+def _graph_search(start, is_goal, successors, lifo, stats):
+    frontier = deque([start])
+    parent = {start: None}
+    stats['allocations'] += 2
+    pop = frontier.pop if lifo else frontier.popleft
+
+    while frontier:
+        state = pop()
+        if is_goal(state):
+            return _rebuild_path(parent, state)
+
+        stats['expanded'] += 1
+        for child in successors(state):
+            if child not in parent:
+                parent[child] = state
+                frontier.append(child)
+                stats['generated'] += 1
+                stats['allocations'] += 2
+        if len(frontier) > stats['peak_frontier']:
+            stats['peak_frontier'] = len(frontier)
+    return None
+
+
+# ---------------- Iterative deepening ----------------
+def _depth_limited(start, is_goal, successors, limit, stats, tt_size=None):
+    """
+    DFS bounded by `limit`; the stack itself is the current path.
+
+    With `tt_size`, states are remembered with the shallowest depth they
+    were reached at in this iteration; a state reached again no shallower
+    has already been searched at least as deep and is skipped. The table
+    keeps at most `tt_size` entries, evicting the least recently used.
+    """
+    if is_goal(start):
+        return [start], False
+    path = [start]
+    on_path = {start}
+    stack = [iter(successors(start))]
+    table = OrderedDict() if tt_size else None
+    stats['expanded'] += 1
+    stats['allocations'] += 3
+    cutoff = False
+
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if child in on_path:
+            continue
+        stats['generated'] += 1
+        if is_goal(child):
+            path.append(child)
+            return path, cutoff
+        if len(path) >= limit:
+            cutoff = True
+            continue
+        depth = len(path)
+        if table is not None:
+            seen = table.get(child)
+            if seen is not None and seen <= depth:
+                table.move_to_end(child)
+                stats['tt_hits'] += 1
+                continue
+            table[child] = depth
+            table.move_to_end(child)
+            if len(table) > tt_size:
+                table.popitem(last=False)
+                stats['tt_evictions'] += 1
+            else:
+                stats['allocations'] += 1
+        path.append(child)
+        on_path.add(child)
+        stack.append(iter(successors(child)))
+        stats['expanded'] += 1
+        stats['allocations'] += 3
+        if len(stack) > stats['peak_frontier']:
+            stats['peak_frontier'] = len(stack)
+    return None, cutoff
+
+
+def _iddfs(start, is_goal, successors, max_depth, stats, tt_size=None):
+    if tt_size:
+        stats['tt_hits'] = stats['tt_evictions'] = 0
+    # _depth_limited goal-tests the children of its deepest expanded layer,
+    # so limit L finds goals at depth <= L and limit 0 would repeat limit 1
+    limit = 1 if max_depth is None else min(1, max_depth)
+    stats['iterations'] = 0
+    while max_depth is None or limit <= max_depth:
+        stats['iterations'] += 1
+        path, cutoff = _depth_limited(start, is_goal, successors, limit, stats, tt_size)
+        if path is not None or not cutoff:
+            return path
+        limit += 1
+    return None
+
+
+def search(start, is_goal, successors, mode="bfs", max_depth=None, tt_size=None):
+    """
+    Search from `start` until `is_goal(state)` holds.
+
+    mode: "bfs", "dfs" or "iddfs". `successors(state)` must return an
+    iterable of hashable states. `tt_size` bounds the iddfs transposition
+    table (None = no table). Returns (path or None, stats).
+    """
+    stats = _new_stats()
+    if mode == "bfs":
+        path = _graph_search(start, is_goal, successors, False, stats)
+    elif mode == "dfs":
+        path = _graph_search(start, is_goal, successors, True, stats)
+    elif mode == "iddfs":
+        path = _iddfs(start, is_goal, successors, max_depth, stats, tt_size)
+    else:
+        raise ValueError("Unknown search mode: " + mode)
+    return path, stats
+
+
+# ---------------- Path-copy baseline (the original scripts) ----------------
+def path_copy_search(start, is_goal, successors, mode="bfs"):
+    """Reference version that pushes (state, path + [state]) like the old scripts."""
+    stats = _new_stats()
+    frontier = deque([(start, [start])])
+    visited = {start}
+    stats['allocations'] += 2
+    pop = frontier.pop if mode == "dfs" else frontier.popleft
+
+    while frontier:
+        state, path = pop()
+        if is_goal(state):
+            return path, stats
+        stats['expanded'] += 1
+        for child in successors(state):
+            if child not in visited:
+                visited.add(child)
+                frontier.append((child, path + [child]))
+                stats['generated'] += 1
+                stats['allocations'] += len(path) + 2
+        if len(frontier) > stats['peak_frontier']:
+            stats['peak_frontier'] = len(frontier)
+    return None, stats
+
+
+# ---------------- Reporting ----------------
+def compare_modes(start, is_goal, successors, modes=("bfs", "dfs", "iddfs"), tt_size=None):
+    """
+    Run each mode and print length, expansions, nodes/sec and the
+    re-expansion overhead relative to BFS (expanded / BFS expanded).
+    """
+    rows = []
+    for mode in modes:
+        t0 = time.perf_counter()
+        path, stats = search(start, is_goal, successors, mode=mode, tt_size=tt_size)
+        elapsed = time.perf_counter() - t0
+        rows.append((mode, path, stats, elapsed))
+    bfs_expanded = next((st['expanded'] for m, _, st, _ in rows if m == "bfs"), None)
+
+    print(f"{'Mode':<7} {'Len':<5} {'Expanded':<9} {'Time (s)':<10} {'Nodes/s':<11} {'vs BFS'}")
+    print("-" * 52)
+    for mode, path, stats, elapsed in rows:
+        length = len(path) - 1 if path else None
+        rate = stats['expanded'] / elapsed if elapsed > 0 else float('inf')
+        overhead = f"{stats['expanded'] / bfs_expanded:.2f}x" if bfs_expanded else "-"
+        print(f"{mode:<7} {str(length):<5} {stats['expanded']:<9} {elapsed:<10.5f} "
+              f"{rate:<11.0f} {overhead}")
+        if 'tt_hits' in stats:
+            print(f"        transposition hits: {stats['tt_hits']}, "
+                  f"evictions: {stats['tt_evictions']} (table size {tt_size})")
+    return rows
+
+
+# ---------------- Memory comparison ----------------
+def _profile(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    path, stats = fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return path, stats, peak, elapsed
+
+
+def _lab1_problems():
+    """(name, start, is_goal, successors) for the four Lab1 scripts."""
+    problems = []
+    for script in ("M&C_BFS", "M&C_DFS"):
+        mod = importlib.import_module(script)
+        problems.append((script, (3, 3, 0), lambda s: s == (0, 0, 1), mod.get_successors))
+    for script in ("Rabbit_BFS", "Rabbit_DFS"):
+        mod = importlib.import_module(script)
+        goal = mod.GOAL_STATE
+        problems.append((script, mod.INITIAL_STATE, lambda s, g=goal: s == g, mod.generate_moves))
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the search kernel against path-copy search")
+    parser.add_argument("--mode", choices=["bfs", "dfs"], default="bfs")
+    args = parser.parse_args()
+
+    print(f"{'Problem':<12} {'Search':<10} {'Len':<5} {'Expanded':<9} {'Allocs':<8} "
+          f"{'Peak frontier':<14} {'Peak KB':<9} {'Time (s)'}")
+    print("-" * 80)
+    for name, start, is_goal, succ in _lab1_problems():
+        for label, fn in (("path-copy", path_copy_search), ("kernel", search)):
+            path, stats, peak, elapsed = _profile(fn, start, is_goal, succ, args.mode)
+            length = len(path) - 1 if path else None
+            print(f"{name:<12} {label:<10} {str(length):<5} {stats['expanded']:<9} "
+                  f"{stats['allocations']:<8} {stats['peak_frontier']:<14} "
+                  f"{peak / 1024:<9.1f} {elapsed:.5f}")
@@ -1,9 +1,14 @@
 # plag_alignment_lev.py
+import bisect
+import gzip
+import hashlib
 import heapq
+import json
 import re
 import argparse
 import os
 import sys
+import tempfile
 import unicodedata
 
 # PDF/Word support
@@ -20,40 +25,89 @@ except:
     _HAS_PYDOCX = False
 
 # ---------------- file reading ----------------
-def read_txt(path):
+# The iter_* readers yield a document in pieces (blocks, pages, paragraphs)
+# whose concatenation is the document text, so a file is never held twice.
+def iter_txt(path, block=1<<16):
     with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-        return f.read()
+        for chunk in iter(lambda: f.read(block), ''):
+            yield chunk
 
-def read_pdf(path):
+def iter_pdf(path):
+    """One piece per page with text; pages are extracted lazily."""
     if not _HAS_PYPDF2:
         raise ImportError("PyPDF2 not installed. pip install PyPDF2")
     reader = PdfReader(path)
-    text = []
+    sep = ''
     for p in reader.pages:
         t = p.extract_text()
         if t:
-            text.append(t)
-    return " ".join(text).replace('\n',' ').replace('\r',' ').strip()
+            yield (sep + t).replace('\n',' ').replace('\r',' ')
+            sep = ' '
 
-def read_docx(path):
+def iter_docx(path):
     if not _HAS_PYDOCX:
         raise ImportError("python-docx not installed. pip install python-docx")
     doc = Document(path)
-    paras = [p.text for p in doc.paragraphs if p.text.strip()]
-    return " ".join(paras).replace('\n',' ').replace('\r',' ').strip()
+    sep = ''
+    for p in doc.paragraphs:
+        if p.text.strip():
+            yield (sep + p.text).replace('\n',' ').replace('\r',' ')
+            sep = ' '
 
-def read_file(path):
+READERS = {'.txt': iter_txt, '.pdf': iter_pdf, '.docx': iter_docx}
+
+def iter_file(path):
     ext = os.path.splitext(path)[1].lower()
-    if ext=='.txt': return read_txt(path)
-    if ext=='.pdf': return read_pdf(path)
-    if ext=='.docx': return read_docx(path)
-    raise ValueError("Unsupported file type: " + ext)
+    if ext not in READERS:
+        raise ValueError("Unsupported file type: " + ext)
+    return READERS[ext](path)
+
+def read_txt(path):
+    return ''.join(iter_txt(path))
+
+def read_pdf(path):
+    return ''.join(iter_pdf(path)).strip()
+
+def read_docx(path):
+    return ''.join(iter_docx(path)).strip()
+
+def read_file(path):
+    text = ''.join(iter_file(path))
+    return text if path.lower().endswith('.txt') else text.strip()
 
 # ---------------- text processing ----------------
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
 def sentence_tokenize(text):
-    sents = re.split(r'(?<=[.!?])\s+', text.strip())
+    sents = SENTENCE_END.split(text.strip())
     return [s.strip() for s in sents if s.strip()]
 
+def iter_sentences(chunks):
+    """
+    sentence_tokenize over the concatenation of `chunks`, one chunk at a
+    time. Each chunk is scanned once, with the previous character as
+    context for the lookbehind; the unfinished sentence is kept as pieces
+    and never re-scanned, so text without sentence ends stays linear.
+    """
+    pending=[]   # pieces of the unfinished sentence
+    prev=''      # last character seen so far
+    for chunk in chunks:
+        if not chunk: continue
+        parts=SENTENCE_END.split(prev+chunk)
+        parts[0]=parts[0][len(prev):]   # a split never falls before prev's end
+        prev=chunk[-1]
+        if len(parts)==1:
+            pending.append(chunk)
+            continue
+        pending.append(parts[0])
+        parts[0]=''.join(pending)
+        pending=[parts.pop()]
+        for s in parts:
+            s=s.strip()
+            if s: yield s
+    tail=''.join(pending).strip()
+    if tail: yield tail
+
 def normalize_sentence(s):
     s = ''.join(c for c in s if unicodedata.category(c)[0]!='C')
     s = unicodedata.normalize('NFKD', s)
@@ -62,8 +116,88 @@ def normalize_sentence(s):
     s = re.sub(r'\s+', ' ', s)
     return s.strip()
 
+# ---------------- extracted-text cache ----------------
+# Bump when read_*, sentence_tokenize or normalize_sentence change output
+# (or the layout of the cache entries below)
+EXTRACTOR_VERSION=2
+TEXT_CACHE_DIR=os.path.join(os.path.dirname(os.path.abspath(__file__)),'.plag_cache','text')
+
+def content_hash(path):
+    h=hashlib.sha256()
+    with open(path,'rb') as f:
+        for block in iter(lambda: f.read(1<<16), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def iter_document(path, sink=None):
+    """
+    (sentence, normalized sentence) pairs of a file, streamed page by page.
+    sink, if given, is called with every raw piece as it is read.
+    """
+    def pieces():
+        for c in iter_file(path):
+            if sink is not None: sink(c)
+            yield c
+    for s in iter_sentences(pieces()):
+        yield s,normalize_sentence(s)
+
+def cache_temp(cache_dir):
+    """A fresh temp file in cache_dir; unique, so concurrent writers of one entry never collide."""
+    fd,tmp=tempfile.mkstemp(dir=cache_dir,suffix='.tmp')
+    os.close(fd)
+    return tmp
+
+def publish(tmp, path):
+    try:
+        os.replace(tmp,path)
+    except OSError:
+        # lost a race for the same entry (or the cache is unwritable): leave it uncached
+        if os.path.exists(tmp): os.remove(tmp)
+
+def extract_document(path, cache_dir=TEXT_CACHE_DIR):
+    """
+    {'sha256', 'sentences', 'normalized'} of a file. With a cache_dir the
+    result is kept as <hash>-v<EXTRACTOR_VERSION>.json.gz, next to the raw
+    text in .txt.gz (written as it is read, never held in memory), so
+    unchanged files are never parsed twice. cache_dir=None disables the cache.
+    """
+    digest=content_hash(path)
+    sentences=[]; normalized=[]
+    if cache_dir is None:
+        for s,n in iter_document(path):
+            sentences.append(s); normalized.append(n)
+        return {'sha256':digest,'sentences':sentences,'normalized':normalized}
+    base=os.path.join(cache_dir,f"{digest}-v{EXTRACTOR_VERSION}")
+    try:
+        with gzip.open(base+'.json.gz','rt',encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError,ValueError):
+        pass
+    os.makedirs(cache_dir,exist_ok=True)
+    text_tmp=cache_temp(cache_dir)
+    try:
+        with gzip.open(text_tmp,'wt',encoding='utf-8') as text:
+            for s,n in iter_document(path,text.write):
+                sentences.append(s); normalized.append(n)
+    except BaseException:
+        os.remove(text_tmp)
+        raise
+    doc={'sha256':digest,'sentences':sentences,'normalized':normalized}
+    doc_tmp=cache_temp(cache_dir)
+    with gzip.open(doc_tmp,'wt',encoding='utf-8') as f:
+        json.dump(doc,f,separators=(',',':'))
+    publish(text_tmp,base+'.txt.gz')
+    publish(doc_tmp,base+'.json.gz')
+    return doc
+
+def load_document(path, cache_dir=TEXT_CACHE_DIR):
+    """Raw and normalized sentences of a file (see extract_document)."""
+    doc=extract_document(path,cache_dir)
+    return doc['sentences'],doc['normalized']
+
 # ---------------- Levenshtein distance ----------------
 def levenshtein(a,b):
+    """Reference O(len(a)*len(b)) DP; kept as the oracle for the fast versions."""
     la, lb = len(a), len(b)
     if la==0: return lb
     if lb==0: return la
@@ -78,36 +212,345 @@ def levenshtein(a,b):
         prev = cur
     return prev[lb]
 
+def levenshtein_myers(a,b):
+    """Exact Levenshtein distance through the bit-parallel core of levenshtein_bounded."""
+    return levenshtein_bounded(a,b)
+
+def levenshtein_bounded(a,b,k=None):
+    """
+    Bit-parallel Levenshtein distance (Myers 1999, Hyyro 2001) if it is
+    <= k, otherwise k+1; k=None gives the exact distance.
+    The longer string is the pattern: each DP column is held as +1/-1
+    vertical-delta bit vectors in Python ints, so sentences longer than
+    64 characters need no blocking, and the loop runs once per character
+    of the shorter string. Bails out on the length difference alone, and
+    inside the loop as soon as the current score minus the characters
+    still to come exceeds k (each remaining character can lower the score
+    by at most one).
+    """
+    if k is None: k=max(len(a),len(b))   # no distance exceeds this
+    if abs(len(a)-len(b))>k: return k+1
+    if len(a)<len(b): a,b=b,a
+    m,n=len(a),len(b)
+    if n==0: return m
+    peq={}
+    bit=1
+    for c in a:
+        peq[c]=peq.get(c,0)|bit
+        bit<<=1
+    mask=bit-1
+    last=1<<(m-1)
+    pv,mv,score=mask,0,m
+    remaining=n
+    for c in b:
+        eq=peq.get(c,0)
+        xv=eq|mv
+        xh=(((eq&pv)+pv)^pv)|eq
+        ph=mv|(~(xh|pv)&mask)
+        mh=pv&xh
+        if ph&last: score+=1
+        elif mh&last: score-=1
+        remaining-=1
+        if score-remaining>k: return k+1
+        ph=((ph<<1)|1)&mask
+        mh=(mh<<1)&mask
+        pv=mh|(~(xv|ph)&mask)
+        mv=ph&xv
+    return score if score<=k else k+1
+
+def qgram_counts(s,q):
+    counts={}
+    for k in range(len(s)-q+1):
+        g=s[k:k+q]
+        counts[g]=counts.get(g,0)+1
+    return counts
+
+class QGramIndex:
+    """
+    Inverted index from character q-grams to the sentences containing them.
+    shared(a) intersects a's q-gram multiset with every indexed sentence at
+    once, touching only the postings of a's own q-grams, so sentences with
+    no q-gram in common are never visited.
+    """
+    def __init__(self,B,q=3):
+        self.q=q
+        self.B=B
+        self.postings={}
+        for j,s in enumerate(B):
+            for g,c in qgram_counts(s,q).items():
+                self.postings.setdefault(g,[]).append((j,c))
+
+    def shared(self,a):
+        """{j: number of q-grams shared by a and B[j]} for the B[j] sharing any."""
+        counts={}
+        for g,c in qgram_counts(a,self.q).items():
+            for j,cb in self.postings.get(g,()):
+                counts[j]=counts.get(j,0)+(c if c<cb else cb)
+        return counts
+
+    def lower_bound(self,a,j,shared):
+        """
+        Lower bound on levenshtein(a, B[j]) by the q-gram lemma: one edit
+        destroys at most q q-grams, so a string with Q q-grams that shares
+        only `shared` of them is at least ceil((Q - shared)/q) edits away.
+        Combined with the length difference.
+        """
+        b=self.B[j]
+        q=self.q
+        grams=max(len(a),len(b))-q+1
+        return max(abs(len(a)-len(b)), -((shared-grams)//q))
+
+def longest_sentence(A,B):
+    """No edit distance between A and B sentences can exceed this."""
+    return max(max(map(len,A),default=0),max(map(len,B),default=0))
+
+def below_floor(lb,lenA,lenB,cutoff,floor):
+    """
+    True if an edit-distance lower bound lb rules a pair out (above cutoff,
+    or similarity under floor %). Similarity is taken against the longer
+    sentence so the test is the same whichever document is A.
+    """
+    if lb>cutoff: return True
+    return floor is not None and 100 - lb/max(lenA,lenB,1)*100<floor
+
+class PairCostCache:
+    """
+    MATCH costs between normalized sentences A[i] and B[j], keyed by (i, j)
+    so each pair is computed at most once and shared by the aligner and
+    the report. Distances above `cutoff` are not computed exactly:
+    cost() returns cutoff+1 for them.
+
+    With a cutoff, a q-gram index over B rules out pairs whose lower bound
+    already exceeds it without running the edit distance, which leaves the
+    costs unchanged. `floor` (similarity %) goes further: pairs whose best
+    possible similarity, relative to the longer of the two sentences, is
+    below it also get cutoff+1, the "dissimilar" cost, so they can never be
+    matched; pairs above the floor stay exact. Both tests are symmetric in
+    A and B, so swapping the documents gives the same costs.
+    """
+    def __init__(self,A,B,cutoff=None,floor=None):
+        self.A,self.B=A,B
+        self.cutoff=cutoff
+        self.floor=floor
+        self.costs={}
+        self.computed=0
+        self.over_cutoff=0
+        self.pruned=0
+        useful=cutoff is not None and (floor is not None or cutoff<longest_sentence(A,B))
+        self.qgrams=QGramIndex(B) if useful else None
+        self.shared_rows={}
+
+    def prunable(self,i,j):
+        """True if A[i], B[j] are known to exceed the cutoff or fall below the floor."""
+        row=self.shared_rows.get(i)
+        if row is None:
+            row=self.shared_rows[i]=self.qgrams.shared(self.A[i])
+        lb=self.qgrams.lower_bound(self.A[i],j,row.get(j,0))
+        return below_floor(lb,len(self.A[i]),len(self.B[j]),self.cutoff,self.floor)
+
+    def cost(self,i,j):
+        c=self.costs.get((i,j))
+        if c is None:
+            if self.cutoff is None:
+                c=levenshtein_myers(self.A[i],self.B[j])
+            elif self.qgrams is not None and self.prunable(i,j):
+                c=self.cutoff+1
+                self.pruned+=1
+                self.over_cutoff+=1
+            else:
+                c=levenshtein_bounded(self.A[i],self.B[j],self.cutoff)
+                if c>self.cutoff: self.over_cutoff+=1
+            self.costs[(i,j)]=c
+            self.computed+=1
+        return c
+
 # ---------------- similarity ----------------
-def similarity_label(sim):
+# Exact / strong / moderate thresholds per alignment unit: word edit
+# distances run higher than character ones for the same rewording
+LABEL_THRESHOLDS={'char':(80,60,40),'word':(70,50,30)}
+
+def similarity_label(sim, unit='char'):
     """sim = similarity percentage"""
-    if sim >= 80: return "Exact match"
-    if sim >= 60: return "Strong similarity"
-    if sim >= 40: return "Moderate similarity"
+    exact,strong,moderate=LABEL_THRESHOLDS[unit]
+    if sim >= exact: return "Exact match"
+    if sim >= strong: return "Strong similarity"
+    if sim >= moderate: return "Moderate similarity"
     return "Low similarity"
 
+def coverage_level(score_percent):
+    if score_percent>=70: return "High"
+    if score_percent>=40: return "Medium"
+    return "Low"
+
+def match_similarity(res, pair_costs, i, j):
+    """(cost, similarity %, label) of the MATCH of A[i] with B[j]."""
+    cost=pair_costs.cost(i,j)
+    sim=100 - cost/max(len(res['normA'][i]),1)*100
+    return cost,sim,similarity_label(sim,res.get('unit','char'))
+
+def alignment_stats(res, pair_costs=None):
+    """Match counts per label and plagiarism coverage (% of A sentences at least moderately similar)."""
+    pair_costs=pair_costs or res.get('pair_costs') or PairCostCache(res['normA'],res['normB'])
+    stats={'matched':0,'exact':0,'strong':0,'moderate':0}
+    for act,pos in res['path']:
+        if act[0]!='MATCH': continue
+        label=match_similarity(res,pair_costs,act[1],act[2])[2]
+        if label=="Exact match": stats['exact']+=1
+        elif label=="Strong similarity": stats['strong']+=1
+        elif label=="Moderate similarity": stats['moderate']+=1
+        stats['matched']+=1
+    total=len(res['rawA'])
+    stats['coverage']=(stats['exact']+stats['strong']+stats['moderate'])/total*100 if total else 0.0
+    stats['level']=coverage_level(stats['coverage'])
+    return stats
+
+def swap_alignment(res):
+    """The same alignment seen from B's side (costs, floor included, are symmetric, so it is optimal for B vs A too)."""
+    path=[]
+    for act,(i,j) in res['path']:
+        if act[0]=='MATCH': act=('MATCH',act[2],act[1])
+        elif act[0]=='SKIP_A': act=('SKIP_B',act[1])
+        else: act=('SKIP_A',act[1])
+        path.append((act,(j,i)))
+    swapped={'path':path,'g':res['g'],'rawA':res['rawB'],'rawB':res['rawA'],'normA':res['normB'],'normB':res['normA']}
+    if 'unit' in res: swapped['unit']=res['unit']
+    return swapped
+
 def truncate(s, length=80):
     return s if len(s)<=length else s[:length]+'...'
 
 # ---------------- A* alignment ----------------
-def align_documents_from_text(docA_text, docB_text, skip_penalty=200):
+def nearest_length_gap(lengths, others):
+    """For each length, the smallest |length - other| over `others` (sorted)."""
+    gaps=[]
+    for L in lengths:
+        k=bisect.bisect_left(others,L)
+        best=None
+        if k<len(others): best=others[k]-L
+        if k>0 and (best is None or L-others[k-1]<best): best=L-others[k-1]
+        gaps.append(best)
+    return gaps
+
+def alignment_heuristic(A, B, skip_penalty):
+    """
+    Consistent lower bound h(i, j) on the cost of aligning A[i:] with B[j:].
+    Each remaining A sentence costs at least min(skip, |len diff| to its
+    closest-length B sentence), because the edit distance is never below
+    the length difference. On top of that, every B sentence beyond the
+    remaining A count must be skipped. The same bound taken from B's side
+    is computed too, and h is the larger of the two.
+    """
+    n,m=len(A),len(B)
+    lenA=[len(s) for s in A]; lenB=[len(s) for s in B]
+    gapA=nearest_length_gap(lenA,sorted(lenB))
+    gapB=nearest_length_gap(lenB,sorted(lenA))
+    SA=[0]*(n+1); SB=[0]*(m+1)
+    for i in range(n-1,-1,-1): SA[i]=SA[i+1]+min(skip_penalty,gapA[i])
+    for j in range(m-1,-1,-1): SB[j]=SB[j+1]+min(skip_penalty,gapB[j])
+    def h(i,j):
+        surplus=(m-j)-(n-i)
+        if surplus>=0: return max(SA[i]+surplus*skip_penalty, SB[j])
+        return max(SA[i], SB[j]-surplus*skip_penalty)
+    return h
+
+def align_documents_from_text(docA_text, docB_text, skip_penalty=200, band=None, engine='astar', floor=None,
+                              unit='char'):
     rawA = sentence_tokenize(docA_text)
     rawB = sentence_tokenize(docB_text)
     A = [normalize_sentence(s) for s in rawA]
     B = [normalize_sentence(s) for s in rawB]
+    return align_sentences(rawA, rawB, A, B, skip_penalty, band, engine, floor, unit)
+
+class TokenInterner:
+    """Maps normalized words to small ints, so word sequences compare as int tuples."""
+    def __init__(self):
+        self.ids={}
+
+    def encode(self, sentence):
+        ids=self.ids
+        return tuple(ids.setdefault(w,len(ids)) for w in sentence.split())
+
+def word_skip_penalty(docs, skip_penalty):
+    """
+    skip_penalty (in characters) rescaled to words by the average characters
+    per word, spaces included, over the normalized sentence lists in docs.
+    """
+    chars=words=0
+    for doc in docs:
+        chars+=sum(len(s)+1 for s in doc)
+        words+=sum(len(s.split()) for s in doc)
+    return max(1,round(skip_penalty*words/max(chars,1)))
+
+def align_sentences(rawA, rawB, A, B, skip_penalty=200, band=None, engine='astar', floor=None,
+                    unit='char', interner=None):
+    """
+    Optimal MATCH / SKIP_A / SKIP_B alignment of normalized sentences A, B.
+    engine='astar' searches the (i, j) grid (see astar_align); engine='dp'
+    uses linear-space dynamic programming (see dp_align). Both return the
+    same cost and result format; band (at least 1) is only supported by
+    astar.
+    floor: see PairCostCache; pairs that cannot reach this similarity %
+    are never matched.
+    unit='word' aligns interned word sequences instead of characters: the
+    edit distances count words, skip_penalty is rescaled to words, and the
+    result's normA/normB hold the int tuples.
+    """
+    if unit=='word':
+        skip_penalty=word_skip_penalty((A,B),skip_penalty)
+        interner=interner or TokenInterner()
+        A=[interner.encode(s) for s in A]
+        B=[interner.encode(s) for s in B]
+    elif unit!='char':
+        raise ValueError("Unknown unit: " + unit)
+    return align_encoded(rawA,rawB,A,B,skip_penalty,band,engine,floor,unit)
+
+def align_encoded(rawA, rawB, A, B, skip_penalty=200, band=None, engine='astar', floor=None, unit='char'):
+    """
+    align_sentences for A, B already in `unit` form: normalized strings for
+    'char', interned int tuples for 'word' with skip_penalty in words. Lets
+    a corpus be interned, and its skip penalty rescaled, once for all pairs.
+    """
+    if band is not None and band<1: raise ValueError("band must be at least 1")
+    if len(A)==0 or len(B)==0: return None
+    if engine=='astar':
+        res=astar_align(A,B,skip_penalty,band,floor)
+    elif engine=='dp':
+        if band is not None: raise ValueError("band is only supported by the astar engine")
+        res=dp_align(A,B,skip_penalty,floor)
+    else:
+        raise ValueError("Unknown engine: " + engine)
+    if res is None: return None
+    res.update({'rawA':rawA,'rawB':rawB,'normA':A,'normB':B,'unit':unit,'skip_penalty':skip_penalty})
+    return res
+
+def astar_align(A, B, skip_penalty=200, band=None, floor=None):
+    """
+    A* over the (i, j) grid of sentence positions, with MATCH / SKIP_A /
+    SKIP_B moves. band: if given, only cells within `band` sentences
+    (counted in the shorter document) of the scaled diagonal are
+    searched; this is faster but may miss the optimum for badly shifted
+    documents. band >= 1 always leaves a path to (n, m).
+    """
     n,m = len(A), len(B)
-    if n==0 or m==0: return None
+    # A MATCH costlier than skipping both sentences can never be optimal
+    pair_costs=PairCostCache(A,B,cutoff=2*skip_penalty,floor=floor)
+    h=alignment_heuristic(A,B,skip_penalty)
+    width=None if band is None else band*max(n,m)
+    def in_band(i,j): return width is None or abs(i*m-j*n)<=width
 
     start=(0,0)
     goal=(n,m)
     frontier=[]
-    heapq.heappush(frontier,(0,0,0,0,None,None))  # (f, g, i, j, parent, action)
+    # (f, -g, i, j, parent, action): ties on f go to the deeper node
+    heapq.heappush(frontier,(h(0,0),0,0,0,None,None))
     came_from={}
     gscore={(0,0):0}
     closed=set()
+    expanded=0
 
     while frontier:
-        f,g,i,j,parent,action = heapq.heappop(frontier)
+        f,neg_g,i,j,parent,action = heapq.heappop(frontier)
+        g=-neg_g
         key=(i,j)
         if key in closed: continue
         came_from[key]=(parent,action)
@@ -120,33 +563,133 @@ def align_documents_from_text(docA_text, docB_text, skip_penalty=200):
                 path.append((act,cur))
                 cur=p
             path.reverse()
-            return {'rawA':rawA,'rawB':rawB,'normA':A,'normB':B,'path':path,'g':g}
+            return {'path':path,'g':g,'pair_costs':pair_costs,'expanded':expanded}
         closed.add(key)
+        expanded+=1
 
         # Match
-        if i<n and j<m:
+        if i<n and j<m and in_band(i+1,j+1) and pair_costs.cost(i,j)<=pair_costs.cutoff:
             ni,nj=i+1,j+1
-            cost=levenshtein(A[i],B[j])
-            ng=g+cost
+            ng=g+pair_costs.cost(i,j)
             if (ni,nj) not in gscore or ng<gscore[(ni,nj)]:
                 gscore[(ni,nj)]=ng
-                heapq.heappush(frontier,(ng,ng,ni,nj,key,('MATCH',i,j)))
+                heapq.heappush(frontier,(ng+h(ni,nj),-ng,ni,nj,key,('MATCH',i,j)))
         # Skip A
-        if i<n:
+        if i<n and in_band(i+1,j):
             ni,nj=i+1,j
             ng=g+skip_penalty
             if (ni,nj) not in gscore or ng<gscore[(ni,nj)]:
                 gscore[(ni,nj)]=ng
-                heapq.heappush(frontier,(ng,ng,ni,nj,key,('SKIP_A',i)))
+                heapq.heappush(frontier,(ng+h(ni,nj),-ng,ni,nj,key,('SKIP_A',i)))
         # Skip B
-        if j<m:
+        if j<m and in_band(i,j+1):
             ni,nj=i,j+1
             ng=g+skip_penalty
             if (ni,nj) not in gscore or ng<gscore[(ni,nj)]:
                 gscore[(ni,nj)]=ng
-                heapq.heappush(frontier,(ng,ng,ni,nj,key,('SKIP_B',j)))
+                heapq.heappush(frontier,(ng+h(ni,nj),-ng,ni,nj,key,('SKIP_B',j)))
     return None
 
+# ---------------- linear-space DP alignment (Hirschberg) ----------------
+def dp_align(A, B, skip_penalty=200, floor=None):
+    """
+    Same optimum as astar_align, found by row-wise DP in O(min(n, m))
+    memory. Hirschberg's divide and conquer recovers the path: the cost of
+    aligning the first half of the longer document is computed forwards,
+    the second half backwards, and the split point of the shorter document
+    that minimises their sum is fixed before both halves are solved
+    recursively. MATCH costs are recomputed as needed instead of cached,
+    which keeps memory linear; the q-gram row of the current X sentence is
+    kept so hopeless pairs are still ruled out without an edit distance.
+    """
+    swapped=len(B)>len(A)
+    X,Y=(B,A) if swapped else (A,B)   # rows over the longer X, columns over the shorter Y
+    cutoff=2*skip_penalty
+    INF=float('inf')
+
+    qgrams=QGramIndex(Y) if floor is not None or cutoff<longest_sentence(X,Y) else None
+    shared=[None,None]   # (x, q-grams X[x] shares with each Y sentence)
+
+    def cost(x,y):
+        if qgrams is not None:
+            if shared[0]!=x: shared[:]=[x,qgrams.shared(X[x])]
+            lb=qgrams.lower_bound(X[x],y,shared[1].get(y,0))
+            if below_floor(lb,len(X[x]),len(Y[y]),cutoff,floor): return INF
+        c=levenshtein_bounded(X[x],Y[y],cutoff)
+        return c if c<=cutoff else INF
+
+    def forward(xlo,xhi,ylo,yhi):
+        """row[k] = cost of aligning X[xlo:xhi] with Y[ylo:ylo+k]."""
+        row=[k*skip_penalty for k in range(yhi-ylo+1)]
+        for x in range(xlo,xhi):
+            prev=row
+            row=[prev[0]+skip_penalty]
+            for k in range(1,yhi-ylo+1):
+                row.append(min(prev[k-1]+cost(x,ylo+k-1), prev[k]+skip_penalty, row[k-1]+skip_penalty))
+        return row
+
+    def backward(xlo,xhi,ylo,yhi):
+        """row[k] = cost of aligning X[xlo:xhi] with Y[ylo+k:yhi]."""
+        q=yhi-ylo
+        row=[(q-k)*skip_penalty for k in range(q+1)]
+        for x in range(xhi-1,xlo-1,-1):
+            prev=row
+            row=[0]*(q+1)
+            row[q]=prev[q]+skip_penalty
+            for k in range(q-1,-1,-1):
+                row[k]=min(prev[k+1]+cost(x,ylo+k), prev[k]+skip_penalty, row[k+1]+skip_penalty)
+        return row
+
+    ops=[]
+    def solve(xlo,xhi,ylo,yhi):
+        if xhi==xlo:
+            ops.extend(('SKIP_Y',y) for y in range(ylo,yhi))
+            return
+        if yhi==ylo:
+            ops.extend(('SKIP_X',x) for x in range(xlo,xhi))
+            return
+        if xhi-xlo==1:
+            # one X sentence: skip everything, or match it with one Y sentence
+            best,best_y=(yhi-ylo+1)*skip_penalty,None
+            for y in range(ylo,yhi):
+                c=cost(xlo,y)+(yhi-ylo-1)*skip_penalty
+                if c<best: best,best_y=c,y
+            if best_y is None:
+                ops.append(('SKIP_X',xlo))
+                ops.extend(('SKIP_Y',y) for y in range(ylo,yhi))
+            else:
+                ops.extend(('SKIP_Y',y) for y in range(ylo,best_y))
+                ops.append(('MATCH',xlo,best_y))
+                ops.extend(('SKIP_Y',y) for y in range(best_y+1,yhi))
+            return
+        mid=(xlo+xhi)//2
+        F=forward(xlo,mid,ylo,yhi)
+        R=backward(mid,xhi,ylo,yhi)
+        k=min(range(len(F)),key=lambda k:F[k]+R[k])
+        solve(xlo,mid,ylo,ylo+k)
+        solve(mid,xhi,ylo+k,yhi)
+
+    solve(0,len(X),0,len(Y))
+
+    # translate X/Y operations back to the A/B path format
+    path=[]
+    i=j=g=0
+    for op in ops:
+        if op[0]=='MATCH':
+            a,b=(op[2],op[1]) if swapped else (op[1],op[2])
+            g+=cost(op[1],op[2])
+            i,j=i+1,j+1
+            path.append((('MATCH',a,b),(i,j)))
+        elif (op[0]=='SKIP_X')!=swapped:
+            g+=skip_penalty
+            i+=1
+            path.append((('SKIP_A',op[1]),(i,j)))
+        else:
+            g+=skip_penalty
+            j+=1
+            path.append((('SKIP_B',op[1]),(i,j)))
+    return {'path':path,'g':g}
+
 # ---------------- pretty print ----------------
 def pretty_print_alignment(res):
     if res is None:
@@ -156,27 +699,25 @@ def pretty_print_alignment(res):
     rawB,resB=res['rawB'],res['rawB']
     path=res['path']
     total_cost=res['g']
+    pair_costs=res.get('pair_costs') or PairCostCache(res['normA'],res['normB'])
 
     print("\n=== Alignment Summary ===")
     print(f"Total alignment cost: {total_cost:.1f}")
-    print(f"Document A sentences: {len(rawA)} | Document B sentences: {len(rawB)}\n")
+    print(f"Document A sentences: {len(rawA)} | Document B sentences: {len(rawB)}")
+    if res.get('unit','char')!='char':
+        print(f"Unit: {res['unit']} (skip penalty {res['skip_penalty']} per sentence)")
+    if 'expanded' in res:
+        print(f"Grid nodes expanded: {res['expanded']} of {(len(rawA)+1)*(len(rawB)+1)}")
+    print()
     hdr=f"{'Action':8} | {'Index A':7} | {'Index B':7} | {'Cost':6} | {'Similarity':10} | {'Label':18} | Sentence A -> Sentence B"
     print(hdr)
     print("-"*len(hdr))
 
-    matched_pairs=0; exact=0; strong=0; moderate=0
-
     for act,pos in path:
         kind=act[0]
         if kind=='MATCH':
             i,j=act[1],act[2]
-            cost=levenshtein(res['normA'][i],res['normB'][j])
-            sim=100 - cost/max(len(res['normA'][i]),1)*100
-            label=similarity_label(sim)
-            if label=="Exact match": exact+=1
-            elif label=="Strong similarity": strong+=1
-            elif label=="Moderate similarity": moderate+=1
-            matched_pairs+=1
+            cost,sim,label=match_similarity(res,pair_costs,i,j)
             print(f"{'MATCH':8} | {i:<7} | {j:<7} | {cost:<6} | {sim:6.1f}%    | {label:<18} | \"{truncate(rawA[i])}\" -> \"{truncate(rawB[j])}\"")
         elif kind=='SKIP_A':
             i=act[1]
@@ -185,46 +726,118 @@ def pretty_print_alignment(res):
             j=act[1]
             print(f"{'SKIP_B':8} | {'-':7} | {j:<7} | {'-':6} | {'-':10} | {'Skipped from B':<18} | (skipped) -> \"{truncate(rawB[j])}\"")
 
+    stats=alignment_stats(res,pair_costs)
+    matched_pairs=stats['matched']
     print("\n=== Quick stats ===")
     print(f"Matched sentence pairs: {matched_pairs}")
-    print(f"Exact matches: {exact}")
-    print(f"Strong similarities: {strong}")
-    print(f"Moderate similarities: {moderate}")
+    print(f"Exact matches: {stats['exact']}")
+    print(f"Strong similarities: {stats['strong']}")
+    print(f"Moderate similarities: {stats['moderate']}")
     if matched_pairs>0:
-        print(f"Exact match ratio: {exact/matched_pairs:.2%}")
-        print(f"Strong similarity ratio: {strong/matched_pairs:.2%}")
-        print(f"Moderate similarity ratio: {moderate/matched_pairs:.2%}")
+        print(f"Exact match ratio: {stats['exact']/matched_pairs:.2%}")
+        print(f"Strong similarity ratio: {stats['strong']/matched_pairs:.2%}")
+        print(f"Moderate similarity ratio: {stats['moderate']/matched_pairs:.2%}")
     print("========================")
 
     # Plagiarism score
-    total_sentences_A=len(rawA)
-    if total_sentences_A>0:
-        score_percent=(exact + strong + moderate)/total_sentences_A*100
-        if score_percent>=70: level="High"
-        elif score_percent>=40: level="Medium"
-        else: level="Low"
+    if len(rawA)>0:
         print(f"\n=== Plagiarism Score ===")
-        print(f"Plagiarism coverage: {score_percent:.1f}% -> {level}")
+        print(f"Plagiarism coverage: {stats['coverage']:.1f}% -> {stats['level']}")
         print("========================\n")
 
     print(f"=== Total Alignment Cost: {total_cost:.1f} ===\n")
 
+# ---------------- corpus screening ----------------
+def index_files(index, paths, cache_dir=TEXT_CACHE_DIR):
+    """Add documents to a MinHashIndex, keyed by absolute path."""
+    for path in paths:
+        raw,norm=load_document(path,cache_dir)
+        doc_id=os.path.abspath(path)
+        if index.add(doc_id,norm,path=doc_id): print(f"Indexed {doc_id} ({len(norm)} sentences)")
+        else: print(f"Skipped {doc_id} (no text)")
+
+def screen_against_corpus(index, path, top=5, skip_penalty=200, band=None, engine='astar', floor=None,
+                          cache_dir=TEXT_CACHE_DIR, unit='char'):
+    """
+    Align one document only against the `top` corpus candidates proposed by
+    the LSH index. Returns [(doc_id, estimated Jaccard, alignment result)].
+    """
+    rawA,A=load_document(path,cache_dir)
+    interner=TokenInterner()
+    results=[]
+    for doc_id,jaccard in index.query(A,top,exclude=os.path.abspath(path)):
+        rawB,B=load_document(doc_id,cache_dir)
+        results.append((doc_id,jaccard,align_sentences(rawA,rawB,A,B,skip_penalty,band,engine,floor,unit,interner)))
+    return results
+
+def print_screening(results):
+    if not results:
+        print("No candidate documents share enough shingles.")
+        return
+    hdr=f"{'Est. Jaccard':12} | {'Coverage':8} | {'Level':6} | {'Cost':10} | Document"
+    print(hdr)
+    print("-"*len(hdr))
+    for doc_id,jaccard,res in results:
+        if res is None:
+            print(f"{jaccard:<12.2f} | {'-':8} | {'-':6} | {'-':10} | {doc_id}")
+            continue
+        stats=alignment_stats(res)
+        print(f"{jaccard:<12.2f} | {stats['coverage']:6.1f}%  | {stats['level']:6} | {res['g']:<10.1f} | {doc_id}")
+
 # ---------------- CLI ----------------
 def main():
     p=argparse.ArgumentParser(description="A* sentence-level alignment (txt,pdf,docx).")
-    p.add_argument('fileA',help="Path to first document")
-    p.add_argument('fileB',help="Path to second document")
+    p.add_argument('fileA',nargs='?',help="Path to first document")
+    p.add_argument('fileB',nargs='?',help="Path to second document (omit with --corpus)")
     p.add_argument('--skip',type=int,default=200,help="Skip penalty (default 200)")
+    p.add_argument('--band',type=int,default=None,
+                   help="Only search within this many sentences of the diagonal (astar engine only)")
+    p.add_argument('--engine',choices=['astar','dp'],default='astar',
+                   help="astar: A* grid search; dp: linear-memory Hirschberg DP for very long documents")
+    p.add_argument('--floor',type=float,default=None,
+                   help="Never match sentence pairs whose similarity %% provably stays below this (e.g. 40)")
+    p.add_argument('--unit',choices=['char','word'],default='char',
+                   help="char: character edit distance; word: interned word edit distance (faster)")
+    p.add_argument('--no-cache',action='store_true',help="Re-extract files instead of using the text cache")
+    p.add_argument('--corpus',metavar='INDEX',help="MinHash index file; compare fileA with its closest documents")
+    p.add_argument('--add',nargs='+',metavar='FILE',help="Add documents to the --corpus index")
+    p.add_argument('--top',type=int,default=5,help="Candidates aligned in --corpus mode (default 5)")
     args=p.parse_args()
+    if args.band is not None and args.engine!='astar':
+        p.error("--band is only supported by --engine astar")
+    if args.band is not None and args.band<1:
+        p.error("--band must be at least 1")
+
+    cache_dir=None if args.no_cache else TEXT_CACHE_DIR
+    if args.corpus:
+        from plag_index import MinHashIndex
+        index=MinHashIndex.load(args.corpus)
+        try:
+            if args.add:
+                index_files(index,args.add,cache_dir)
+                index.save(args.corpus)
+            if args.fileA:
+                results=screen_against_corpus(index,args.fileA,args.top,args.skip,args.band,args.engine,args.floor,
+                                              cache_dir,args.unit)
+        except Exception as e:
+            print("Error reading files:",e)
+            sys.exit(1)
+        if args.fileA:
+            print(f"Corpus documents: {len(index.docs)} | Candidates aligned: {len(results)}\n")
+            print_screening(results)
+        return
+    if not args.fileA or not args.fileB:
+        p.error("fileA and fileB are required unless --corpus is given")
 
     try:
-        textA=read_file(args.fileA)
-        textB=read_file(args.fileB)
+        rawA,A=load_document(args.fileA,cache_dir)
+        rawB,B=load_document(args.fileB,cache_dir)
     except Exception as e:
         print("Error reading files:",e)
         sys.exit(1)
 
-    res=align_documents_from_text(textA,textB,skip_penalty=args.skip)
+    res=align_sentences(rawA,rawB,A,B,skip_penalty=args.skip,band=args.band,engine=args.engine,floor=args.floor,
+                        unit=args.unit)
     pretty_print_alignment(res)
 
 if __name__=="__main__":
@@ -0,0 +1,215 @@
+"""
+Many-vs-many plagiarism screening of a directory of submissions.
+
+Every supported file (.txt, .pdf, .docx) is extracted and normalized once,
+in parallel, through plag.py's extracted-text cache. Each unordered pair
+is then aligned once on a process pool; the optimal alignment of A with
+B, read from B's side, is also optimal for B with A, so both coverage
+directions come from the same run.
+
+With --unit word the class is interned to word IDs once, and one word
+skip penalty is derived from all documents, so every cost in the matrix
+uses the same scale.
+
+Pair results are cached on disk under the sha256 of both files' contents
+plus the extractor version and alignment parameters, so re-running on a
+class where only a few submissions changed only aligns the pairs that
+involve them.
+
+Output: a coverage matrix (row document's % of sentences found in the
+column document) as CSV, and the matrix plus per-pair details as JSON.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from plag import (EXTRACTOR_VERSION, TokenInterner, align_encoded, alignment_stats, cache_temp, content_hash,
+                  extract_document, publish, swap_alignment, word_skip_penalty)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(HERE, ".plag_cache")
+EXTENSIONS = (".txt", ".pdf", ".docx")
+CACHE_VERSION = 1
+
+
+def list_documents(directory):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(EXTENSIONS) and os.path.isfile(os.path.join(directory, name)))
+
+
+def extract_job(job):
+    """Worker: (content hash, raw sentences, normalized sentences) of one file."""
+    path, text_cache = job
+    doc = extract_document(path, text_cache)
+    return doc["sha256"], doc["sentences"], doc["normalized"]
+
+
+def pair_key(hash_a, hash_b, params):
+    """
+    Cache key of an unordered pair of contents under the given alignment
+    parameters and extractor version (new sentence splitting or
+    normalization changes the result even for the same bytes).
+    """
+    first, second = sorted((hash_a, hash_b))
+    blob = json.dumps([CACHE_VERSION, EXTRACTOR_VERSION, first, second, params], sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def pair_cache_path(cache_dir, key):
+    return os.path.join(cache_dir, "pairs", key[:2], key + ".json")
+
+
+def load_cached(cache_dir, key):
+    try:
+        with open(pair_cache_path(cache_dir, key), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(cache_dir, key, result):
+    path = pair_cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = cache_temp(os.path.dirname(path))
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    publish(tmp, path)
+
+
+def align_job(job):
+    """
+    Worker: align one pair and summarize it from both sides, keyed by
+    content hash. Sentences come already encoded for params["unit"].
+    """
+    (hash_a, raw_a, enc_a), (hash_b, raw_b, enc_b), params = job
+    skip = params["word_skip"] if params["unit"] == "word" else params["skip"]
+    res = align_encoded(raw_a, raw_b, enc_a, enc_b, skip, params["band"],
+                        params["engine"], params["floor"], params["unit"])
+    if res is None:
+        return {"cost": None, "coverage": {hash_a: 0.0, hash_b: 0.0}}
+    return {"cost": res["g"],
+            "coverage": {hash_a: alignment_stats(res)["coverage"],
+                         hash_b: alignment_stats(swap_alignment(res))["coverage"]}}
+
+
+def run_batch(paths, skip_penalty=200, band=None, engine="astar", floor=None,
+              workers=None, cache_dir=CACHE_DIR, use_cache=True, unit="char"):
+    """
+    Align every pair of documents. Returns (docs, pairs) where docs holds
+    {'path', 'sha256', 'sentences'} per file and pairs holds
+    {'a', 'b', 'cost', 'coverage_a', 'coverage_b', 'cached'} per pair
+    (indices into docs, a < b).
+    """
+    params = {"skip": skip_penalty, "band": band, "engine": engine, "floor": floor, "unit": unit}
+    text_cache = os.path.join(cache_dir, "text") if use_cache else None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # extract each distinct content once: identical submissions would
+        # otherwise be parsed (and written to the text cache) side by side
+        hashes = list(pool.map(content_hash, paths))
+        first = {}
+        for path, digest in zip(paths, hashes):
+            first.setdefault(digest, path)
+        unique = dict(zip(first, pool.map(extract_job, [(p, text_cache) for p in first.values()])))
+        extracted = [unique[digest] for digest in hashes]
+        docs = [{"path": p, "sha256": h, "sentences": len(norm)}
+                for p, (h, raw, norm) in zip(paths, extracted)]
+        if unit == "word":
+            # intern every document once, and use one word skip penalty for
+            # the whole class so all costs in the matrix are comparable
+            params["word_skip"] = word_skip_penalty([norm for h, raw, norm in unique.values()], skip_penalty)
+            interner = TokenInterner()
+            encoded = {h: (h, raw, [interner.encode(s) for s in norm]) for h, raw, norm in unique.values()}
+            extracted = [encoded[digest] for digest in hashes]
+
+        pairs, jobs, pending = [], [], []
+        for a in range(len(paths)):
+            for b in range(a + 1, len(paths)):
+                key = pair_key(extracted[a][0], extracted[b][0], params)
+                result = load_cached(cache_dir, key) if use_cache else None
+                pairs.append({"a": a, "b": b, "key": key, "result": result, "cached": result is not None})
+                if result is None:
+                    jobs.append((extracted[a], extracted[b], params))
+                    pending.append(pairs[-1])
+        for pair, result in zip(pending, pool.map(align_job, jobs)):
+            pair["result"] = result
+            if use_cache:
+                store_cached(cache_dir, pair["key"], result)
+
+    rows = []
+    for pair in pairs:
+        result = pair["result"]
+        rows.append({"a": pair["a"], "b": pair["b"], "cost": result["cost"],
+                     "coverage_a": result["coverage"][docs[pair["a"]]["sha256"]],
+                     "coverage_b": result["coverage"][docs[pair["b"]]["sha256"]],
+                     "cached": pair["cached"]})
+    return docs, rows
+
+
+def coverage_matrix(docs, pairs):
+    matrix = [[None] * len(docs) for _ in docs]
+    for pair in pairs:
+        matrix[pair["a"]][pair["b"]] = pair["coverage_a"]
+        matrix[pair["b"]][pair["a"]] = pair["coverage_b"]
+    return matrix
+
+
+def write_outputs(docs, pairs, prefix):
+    names = [os.path.basename(d["path"]) for d in docs]
+    matrix = coverage_matrix(docs, pairs)
+    with open(prefix + ".csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["document"] + names)
+        for name, row in zip(names, matrix):
+            writer.writerow([name] + ["" if v is None else f"{v:.1f}" for v in row])
+    with open(prefix + ".json", "w") as f:
+        json.dump({"documents": docs, "coverage": matrix, "pairs": pairs}, f, indent=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pairwise plagiarism screening of a directory (txt,pdf,docx)")
+    parser.add_argument("directory")
+    parser.add_argument("--skip", type=int, default=200, help="Skip penalty (default 200)")
+    parser.add_argument("--band", type=int, default=None,
+                        help="Only search within this many sentences of the diagonal (astar engine only)")
+    parser.add_argument("--engine", choices=["astar", "dp"], default="astar")
+    parser.add_argument("--floor", type=float, default=None,
+                        help="Never match sentence pairs whose similarity %% provably stays below this")
+    parser.add_argument("--unit", choices=["char", "word"], default="char")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Text and pair result cache (default Lab2/.plag_cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write cached texts or pair results")
+    parser.add_argument("--out", default=None, help="Output path prefix (default DIRECTORY/plag_matrix)")
+    args = parser.parse_args()
+    if args.band is not None and args.engine != "astar":
+        parser.error("--band is only supported by --engine astar")
+    if args.band is not None and args.band < 1:
+        parser.error("--band must be at least 1")
+
+    paths = list_documents(args.directory)
+    if len(paths) < 2:
+        print("Need at least two .txt/.pdf/.docx files in", args.directory)
+        sys.exit(1)
+    out = args.out or os.path.join(args.directory, "plag_matrix")
+    start = time.perf_counter()
+    try:
+        docs, pairs = run_batch(paths, args.skip, args.band, args.engine, args.floor,
+                                args.workers, args.cache_dir, not args.no_cache, args.unit)
+    except Exception as e:
+        print("Error reading files:", e)
+        sys.exit(1)
+    write_outputs(docs, pairs, out)
+
+    print(f"{'Coverage A':<11} {'Coverage B':<11} {'Cost':<10} {'Cached':<7} Pair")
+    print("-" * 60)
+    for pair in sorted(pairs, key=lambda p: -max(p["coverage_a"], p["coverage_b"])):
+        cost = "-" if pair["cost"] is None else f"{pair['cost']:.1f}"
+        print(f"{pair['coverage_a']:<11.1f} {pair['coverage_b']:<11.1f} {cost:<10} "
+              f"{'yes' if pair['cached'] else 'no':<7} "
+              f"{os.path.basename(docs[pair['a']]['path'])} / {os.path.basename(docs[pair['b']]['path'])}")
+    cached = sum(p["cached"] for p in pairs)
+    print(f"\n{len(pairs)} pairs ({cached} cached) in {time.perf_counter() - start:.1f}s -> {out}.csv / .json")
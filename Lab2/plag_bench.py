@@ -0,0 +1,89 @@
+# plag_bench.py -- microbenchmarks for the edit-distance engines and alignment units in plag.py
+import argparse
+import os
+import random
+import sys
+import time
+
+from plag import TokenInterner, align_sentences, alignment_stats, levenshtein, levenshtein_myers, load_document
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUCKETS = [(0, 64), (65, 128), (129, 256), (257, 10**9)]
+
+def time_pairs(fn, pairs, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for a, b in pairs:
+            fn(a, b)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_levenshtein(A, B, max_pairs=500, repeat=3, seed=0):
+    """Per-pair time of the reference DP vs the bit-parallel engine, bucketed by sentence length."""
+    pairs = [(a, b) for a in A for b in B]
+    rng = random.Random(seed)
+    if len(pairs) > max_pairs:
+        pairs = rng.sample(pairs, max_pairs)
+    for a, b in pairs:
+        assert levenshtein(a, b) == levenshtein_myers(a, b)
+
+    print(f"{'Max length':<12} {'Pairs':<7} {'DP us/pair':<12} {'Myers us/pair':<14} {'Speedup'}")
+    print("-" * 55)
+    for lo, hi in BUCKETS + [(0, 10**9)]:
+        bucket = [(a, b) for a, b in pairs if lo <= max(len(a), len(b)) <= hi]
+        if not bucket:
+            continue
+        t_dp = time_pairs(levenshtein, bucket, repeat)
+        t_bp = time_pairs(levenshtein_myers, bucket, repeat)
+        label = "all" if (lo, hi) == (0, 10**9) else (f"{lo}-{hi}" if hi < 10**9 else f">{lo - 1}")
+        print(f"{label:<12} {len(bucket):<7} {t_dp / len(bucket) * 1e6:<12.1f} "
+              f"{t_bp / len(bucket) * 1e6:<14.1f} {t_dp / t_bp:.1f}x")
+
+def bench_units(docA, docB, skip_penalty=200, engine='astar'):
+    """Whole-alignment time, cost and coverage in character vs word mode, plus per-pair edit distance time."""
+    (rawA, A), (rawB, B) = docA, docB
+    interner = TokenInterner()
+    pairs = list(zip(A, B))
+    word_pairs = [(interner.encode(a), interner.encode(b)) for a, b in pairs]
+    t_char = time_pairs(levenshtein_myers, pairs, 3) / max(len(pairs), 1)
+    t_word = time_pairs(levenshtein_myers, word_pairs, 3) / max(len(pairs), 1)
+    print(f"\nMyers per pair: char {t_char * 1e6:.1f} us | word {t_word * 1e6:.1f} us | {t_char / t_word:.1f}x")
+
+    print(f"\n{'Unit':<6} {'Time (s)':<10} {'Cost':<10} {'Coverage':<10} {'Matched'}")
+    print("-" * 46)
+    times = {}
+    for unit in ('char', 'word'):
+        start = time.perf_counter()
+        res = align_sentences(rawA, rawB, A, B, skip_penalty, engine=engine, unit=unit)
+        times[unit] = time.perf_counter() - start
+        stats = alignment_stats(res)
+        coverage = f"{stats['coverage']:.1f}%"
+        print(f"{unit:<6} {times[unit]:<10.2f} {res['g']:<10.1f} {coverage:<10} {stats['matched']}")
+    print(f"Word mode speedup: {times['char'] / times['word']:.1f}x")
+
+def main():
+    p = argparse.ArgumentParser(description="Edit-distance microbenchmark on real sentence pairs.")
+    p.add_argument('fileA', nargs='?', default=os.path.join(HERE, 'a.pdf'))
+    p.add_argument('fileB', nargs='?', default=os.path.join(HERE, 'b.docx'))
+    p.add_argument('--pairs', type=int, default=500, help="Max sentence pairs sampled (default 500)")
+    p.add_argument('--repeat', type=int, default=3, help="Timing repetitions, best is kept")
+    p.add_argument('--skip', type=int, default=200, help="Skip penalty for the unit comparison (default 200)")
+    p.add_argument('--no-units', action='store_true', help="Skip the char vs word alignment comparison")
+    args = p.parse_args()
+
+    try:
+        docA = load_document(args.fileA)
+        docB = load_document(args.fileB)
+    except Exception as e:
+        print("Error reading files:", e)
+        sys.exit(1)
+    A, B = docA[1], docB[1]
+    print(f"Document A sentences: {len(A)} | Document B sentences: {len(B)}\n")
+    bench_levenshtein(A, B, args.pairs, args.repeat)
+    if not args.no_units:
+        bench_units(docA, docB, args.skip)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# plag_index.py -- MinHash / LSH candidate index for corpus-scale screening
+import hashlib
+import json
+import os
+import random
+
+MERSENNE = (1 << 61) - 1
+
+def shingles(norm_sentences, k=3):
+    """Word k-gram shingles taken inside each normalized sentence (short sentences give one shingle)."""
+    out = set()
+    for s in norm_sentences:
+        words = s.split()
+        if not words:
+            continue
+        if len(words) <= k:
+            out.add(" ".join(words))
+        else:
+            for i in range(len(words) - k + 1):
+                out.add(" ".join(words[i:i + k]))
+    return out
+
+def stable_hash(text):
+    """64-bit hash that is the same in every process (unlike the salted built-in hash)."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class MinHashIndex:
+    """
+    Persistent MinHash signatures with LSH banding.
+
+    Each document is reduced to `num_perm` minima of universal hashes
+    (a*x + b mod 2^61-1) over its shingle hashes. The signature is cut into
+    `bands` bands; documents that agree on a whole band share a bucket and
+    become candidates. Candidates are ranked by the fraction of equal
+    signature entries, which estimates the Jaccard similarity of the
+    shingle sets. Adding a document only touches its own buckets.
+    """
+    def __init__(self, num_perm=128, bands=64, shingle_size=3, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = random.Random(seed)
+        self.perms = [(rng.randrange(1, MERSENNE), rng.randrange(0, MERSENNE)) for _ in range(num_perm)]
+        self.docs = {}      # doc_id -> {'path': ..., 'signature': [...]}
+        self.buckets = {}   # (band, band hash) -> [doc_id, ...]
+
+    # ---------------- signatures ----------------
+    def signature(self, norm_sentences):
+        hashes = [stable_hash(s) for s in shingles(norm_sentences, self.shingle_size)]
+        if not hashes:
+            return None
+        return [min((a * x + b) % MERSENNE for x in hashes) for a, b in self.perms]
+
+    def band_keys(self, sig):
+        r = self.rows
+        return [(band, hash(tuple(sig[band * r:(band + 1) * r]))) for band in range(self.bands)]
+
+    # ---------------- updates / queries ----------------
+    def add(self, doc_id, norm_sentences, path=None):
+        """Index (or re-index) one document. Returns False if it has no text."""
+        sig = self.signature(norm_sentences)
+        if sig is None:
+            return False
+        if doc_id in self.docs:
+            self.remove(doc_id)
+        self.docs[doc_id] = {'path': path, 'signature': sig}
+        for key in self.band_keys(sig):
+            self.buckets.setdefault(key, []).append(doc_id)
+        return True
+
+    def remove(self, doc_id):
+        entry = self.docs.pop(doc_id)
+        for key in self.band_keys(entry['signature']):
+            bucket = self.buckets.get(key)
+            if bucket and doc_id in bucket:
+                bucket.remove(doc_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def query(self, norm_sentences, top=5, exclude=None):
+        """Top candidate documents as (doc_id, estimated Jaccard), best first."""
+        sig = self.signature(norm_sentences)
+        if sig is None:
+            return []
+        candidates = set()
+        for key in self.band_keys(sig):
+            candidates.update(self.buckets.get(key, ()))
+        candidates.discard(exclude)
+        scored = []
+        for doc_id in candidates:
+            other = self.docs[doc_id]['signature']
+            same = sum(1 for x, y in zip(sig, other) if x == y)
+            scored.append((doc_id, same / self.num_perm))
+        scored.sort(key=lambda t: (-t[1], t[0]))
+        return scored[:top]
+
+    # ---------------- persistence ----------------
+    def save(self, path):
+        data = {'num_perm': self.num_perm, 'bands': self.bands,
+                'shingle_size': self.shingle_size, 'seed': self.seed, 'docs': self.docs}
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index from disk, or start an empty one if the file does not exist."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        index = cls(data['num_perm'], data['bands'], data['shingle_size'], data['seed'])
+        for doc_id, entry in data['docs'].items():
+            index.docs[doc_id] = entry
+            for key in index.band_keys(entry['signature']):
+                index.buckets.setdefault(key, []).append(doc_id)
+        return index
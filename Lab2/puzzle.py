@@ -1,47 +1,63 @@
+import heapq
+import math
 import random
 import time
 import tracemalloc
 from collections import deque
 
+def make_goal(width):
+    """Goal state of the width x width sliding puzzle: 1..N*N-1 then the blank."""
+    return list(range(1, width * width)) + [0]
+
 # Goal state for Puzzle-8
-GOAL_STATE = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+GOAL_STATE = make_goal(3)
 
-# ---------------- Puzzle-8 Environment ----------------
+# ---------------- Sliding-Puzzle Environment (N x N) ----------------
 def expand(state):
-    """Return all valid successor states from current state."""
+    """Return all valid successor states from current state (board width from len(state))."""
     moves = []
+    width = math.isqrt(len(state))
     idx = state.index(0)
-    row, col = divmod(idx, 3)
+    row, col = divmod(idx, width)
     directions = {'Up': (-1,0), 'Down': (1,0), 'Left': (0,-1), 'Right': (0,1)}
     for dr, dc in directions.values():
         r, c = row + dr, col + dc
-        if 0 <= r < 3 and 0 <= c < 3:
+        if 0 <= r < width and 0 <= c < width:
             new_state = state[:]
-            new_idx = r * 3 + c
+            new_idx = r * width + c
             new_state[idx], new_state[new_idx] = new_state[new_idx], new_state[idx]
             moves.append(new_state)
     return moves
 
-def generate_puzzle_at_depth(d):
-    """Generate a Puzzle-8 instance at given depth d from the goal state."""
-    state = GOAL_STATE[:]
+def generate_puzzle_at_depth(d, goal=GOAL_STATE):
+    """
+    Generate an instance by a random walk of d moves from the goal state.
+    The walk may backtrack, so the optimal depth is often less than d;
+    see puzzle_db.generate_puzzle_at_exact_depth for exact-depth instances.
+    """
+    state = goal[:]
     for _ in range(d):
         state = random.choice(expand(state))
     return state
 
 # ---------------- Graph Search Agent (Uniform Cost BFS) ----------------
-def graph_search(initial_state, goal_state):
+def graph_search(initial_state, goal_state, stats=None):
     """
     Implements BFS assuming uniform cost per move (UCS equivalent).
     Returns path from initial to goal and number of moves.
+    If a `stats` dict is given, the number of expanded nodes is stored in it.
     """
     frontier = deque([initial_state])
     came_from = {tuple(initial_state): None}
     explored = set()
+    if stats is not None:
+        stats['expanded'] = 0
 
     while frontier:
         node = frontier.popleft()
         explored.add(tuple(node))
+        if stats is not None:
+            stats['expanded'] += 1
 
         if node == goal_state:
             # Backtrack to get the path
@@ -59,28 +75,233 @@ def graph_search(initial_state, goal_state):
                 came_from[tchild] = tuple(node)
     return None
 
+# ---------------- A* Agent (Manhattan + Linear Conflict) ----------------
+# Per-tile tables for GOAL_STATE: goal row/col and Manhattan distance from every cell
+GOAL_ROW = [0] * 9
+GOAL_COL = [0] * 9
+for _pos, _tile in enumerate(GOAL_STATE):
+    GOAL_ROW[_tile], GOAL_COL[_tile] = divmod(_pos, 3)
+MANHATTAN = [[0 if tile == 0 else abs(pos // 3 - GOAL_ROW[tile]) + abs(pos % 3 - GOAL_COL[tile])
+              for pos in range(9)] for tile in range(9)]
+
+_line_cache = {}
+
+def line_conflict(line, is_row, tiles):
+    """
+    Linear-conflict penalty of one row/column given its tiles in order.
+    Tiles whose goal lies in this line but appear in the wrong relative
+    order need at least 2 extra moves each for all but the longest
+    correctly ordered subsequence. Results are cached per line content;
+    tiles may be a list or tuple slice of the state.
+    """
+    key = (is_row, line, tuple(tiles))
+    value = _line_cache.get(key)
+    if value is None:
+        goal_line, goal_along = (GOAL_ROW, GOAL_COL) if is_row else (GOAL_COL, GOAL_ROW)
+        targets = [goal_along[t] for t in tiles if t != 0 and goal_line[t] == line]
+        # longest increasing subsequence of goal positions (tiny lines: O(k^2))
+        best = [1] * len(targets)
+        for i in range(len(targets)):
+            for j in range(i):
+                if targets[j] < targets[i] and best[j] + 1 > best[i]:
+                    best[i] = best[j] + 1
+        value = 2 * (len(targets) - max(best, default=0))
+        _line_cache[key] = value
+    return value
+
+def row_conflict(state, r):
+    return line_conflict(r, True, state[r * 3:r * 3 + 3])
+
+def col_conflict(state, c):
+    return line_conflict(c, False, state[c::3])
+
+def heuristic(state):
+    """Manhattan distance plus linear conflicts (admissible)."""
+    h = sum(MANHATTAN[tile][pos] for pos, tile in enumerate(state))
+    for k in range(3):
+        h += row_conflict(state, k) + col_conflict(state, k)
+    return h
+
+def expand_with_h(state, blank, h):
+    """
+    Yield (child, child_blank, child_h) for a tuple state, updating the
+    heuristic incrementally: the moved tile's Manhattan term changes, and
+    only the two lines the tile crosses can change their conflicts.
+    """
+    row, col = divmod(blank, 3)
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        r, c = row + dr, col + dc
+        if 0 <= r < 3 and 0 <= c < 3:
+            new_blank = r * 3 + c
+            tile = state[new_blank]
+            child = list(state)
+            child[blank], child[new_blank] = tile, 0
+            child = tuple(child)
+            dh = MANHATTAN[tile][blank] - MANHATTAN[tile][new_blank]
+            if dr:  # vertical move: the tile changes rows, column order is unchanged
+                dh += (row_conflict(child, row) + row_conflict(child, r)
+                       - row_conflict(state, row) - row_conflict(state, r))
+            else:   # horizontal move: the tile changes columns
+                dh += (col_conflict(child, col) + col_conflict(child, c)
+                       - col_conflict(state, col) - col_conflict(state, c))
+            yield child, new_blank, h + dh
+
+def astar_search(initial_state, goal_state, stats=None):
+    """
+    A* with the Manhattan + linear-conflict heuristic over tuple states.
+    Same return value as graph_search (list of states, start->goal).
+    """
+    start = tuple(initial_state)
+    goal = tuple(goal_state)
+    if goal != tuple(GOAL_STATE):
+        raise ValueError("astar_search tables are built for GOAL_STATE")
+    g_score = {start: 0}
+    came_from = {start: None}
+    frontier = [(heuristic(start), 0, start, start.index(0))]
+    expanded = 0
+
+    while frontier:
+        f, g, node, blank = heapq.heappop(frontier)
+        if g > g_score[node]:
+            continue  # stale entry
+        if node == goal:
+            path = []
+            cur = node
+            while cur is not None:
+                path.append(list(cur))
+                cur = came_from[cur]
+            if stats is not None:
+                stats['expanded'] = expanded
+            return path[::-1]
+        expanded += 1
+        h = f - g
+        for child, child_blank, child_h in expand_with_h(node, blank, h):
+            ng = g + 1
+            if ng < g_score.get(child, ng + 1):
+                g_score[child] = ng
+                came_from[child] = node
+                heapq.heappush(frontier, (ng + child_h, ng, child, child_blank))
+    if stats is not None:
+        stats['expanded'] = expanded
+    return None
+
+# ---------------- Bidirectional BFS ----------------
+def pack_state(state):
+    """Pack a state into one int, 4 bits per cell (cell 0 in the low bits)."""
+    code = 0
+    for pos, tile in enumerate(state):
+        code |= tile << (4 * pos)
+    return code
+
+def unpack_state(code, cells):
+    return [(code >> (4 * pos)) & 15 for pos in range(cells)]
+
+def bidirectional_search(initial_state, goal_state, stats=None):
+    """
+    BFS from both ends, one whole layer at a time from the smaller side.
+    Each side keeps a single dict packed_state -> packed_parent; the
+    shortest meeting point over a finished layer is spliced into one path.
+    Same return value as graph_search.
+    """
+    cells = len(initial_state)
+    width = math.isqrt(cells)
+    neighbours = [[r * width + c for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                   if 0 <= r < width and 0 <= c < width]
+                  for row, col in (divmod(i, width) for i in range(cells))]
+    start, goal = pack_state(initial_state), pack_state(goal_state)
+    parents = ({start: None}, {goal: None})
+    frontiers = ([(start, initial_state.index(0))], [(goal, goal_state.index(0))])
+    expanded = 0
+
+    def depth_of(side, code):
+        d = 0
+        while parents[side][code] is not None:
+            code = parents[side][code]
+            d += 1
+        return d
+
+    meet = start if start == goal else None
+    depths = [0, 0]
+    while meet is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = parents[side], parents[1 - side]
+        best = None
+        next_layer = []
+        for code, blank in frontiers[side]:
+            expanded += 1
+            for nb in neighbours[blank]:
+                tile = (code >> (4 * nb)) & 15
+                child = code ^ (tile << (4 * nb)) ^ (tile << (4 * blank))
+                if child in mine:
+                    continue
+                mine[child] = code
+                next_layer.append((child, nb))
+                if child in other:
+                    total = depths[side] + 1 + depth_of(1 - side, child)
+                    if best is None or total < best[0]:
+                        best = (total, child)
+        frontiers = (next_layer, frontiers[1]) if side == 0 else (frontiers[0], next_layer)
+        depths[side] += 1
+        if best is not None:
+            meet = best[1]
+
+    if stats is not None:
+        stats['expanded'] = expanded
+    if meet is None:
+        return None
+    path = []
+    code = meet
+    while code is not None:
+        path.append(unpack_state(code, cells))
+        code = parents[0][code]
+    path.reverse()
+    code = parents[1][meet]
+    while code is not None:
+        path.append(unpack_state(code, cells))
+        code = parents[1][code]
+    return path
+
+SEARCHES = {
+    "BFS": graph_search,
+    "BiBFS": bidirectional_search,
+    "A*": astar_search,
+}
+
 # ---------------- Measure Memory and Time ----------------
-def measure_instance(depth):
-    """Generate a puzzle and measure memory, time, moves to solve it."""
-    instance = generate_puzzle_at_depth(depth)
+def measure_instance(depth, algorithm="BFS", instance=None):
+    """
+    Measure memory, time, moves to solve `instance`, or a random puzzle
+    whose optimal solution is exactly `depth` moves if none is given.
+    """
+    if instance is None:
+        from puzzle_db import generate_puzzle_at_exact_depth
+        instance = generate_puzzle_at_exact_depth(depth)
+    search = SEARCHES[algorithm]
+    stats = {}
     tracemalloc.start()
     start_time = time.time()
-    path = graph_search(instance, GOAL_STATE)
+    path = search(instance, GOAL_STATE, stats)
     end_time = time.time()
     current, peak = tracemalloc.get_traced_memory()
     tracemalloc.stop()
     return {
         "Depth": depth,
+        "Algorithm": algorithm,
         "Memory_MB": round(peak / 1024 / 1024, 2),
         "Time_s": round(end_time - start_time, 4),
-        "Moves": len(path)-1 if path else None
+        "Moves": len(path)-1 if path else None,
+        "Expanded": stats.get('expanded')
     }
 
 # ---------------- Run Example ----------------
 if __name__ == "__main__":
-    depths = [6,8,10,13,15,17,20,25,40]  # Change or extend as needed
-    print(f"{'Depth':<6} {'Memory (MB)':<12} {'Time (s)':<10} {'Moves'}")
-    print("-"*40)
+    from puzzle_db import generate_puzzle_at_exact_depth
+    depths = [6,8,10,13,15,17,20,25,31]  # Change or extend as needed (max 31)
+    print(f"{'Depth':<6} {'Algorithm':<10} {'Memory (MB)':<12} {'Time (s)':<10} {'Moves':<6} {'Expanded'}")
+    print("-"*56)
     for d in depths:
-        result = measure_instance(d)
-        print(f"{result['Depth']:<6} {result['Memory_MB']:<12} {result['Time_s']:<10} {result['Moves']}")
+        instance = generate_puzzle_at_exact_depth(d)  # same instance for every algorithm
+        for algorithm in SEARCHES:
+            result = measure_instance(d, algorithm, instance)
+            print(f"{result['Depth']:<6} {result['Algorithm']:<10} {result['Memory_MB']:<12} "
+                  f"{result['Time_s']:<10} {str(result['Moves']):<6} {result['Expanded']}")
@@ -0,0 +1,133 @@
+"""
+Multi-process benchmark for the 8-puzzle searches in puzzle.py.
+
+For every depth, K instances of exactly that optimal depth are drawn
+from seeded generators, so runs are reproducible. Each (algorithm,
+instance) job runs twice in a worker: once timed with perf_counter and
+no tracing, and once under tracemalloc for peak memory only. That keeps
+tracing overhead out of the timings.
+
+Per depth and algorithm the mean / median / p95 of time, peak memory and
+nodes expanded are written to CSV and JSON next to results.csv.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from puzzle import GOAL_STATE, SEARCHES
+from puzzle_db import generate_puzzle_at_exact_depth, get_database
+
+OUT_PREFIX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle_bench")
+METRICS = ("time_s", "memory_mb", "expanded")
+
+
+def run_job(job):
+    """Worker: solve one seeded instance, timed and memory-profiled separately."""
+    algorithm, depth, seed, profile_memory = job
+    instance = generate_puzzle_at_exact_depth(depth, random.Random(seed))
+    search = SEARCHES[algorithm]
+
+    stats = {}
+    t0 = time.perf_counter()
+    path = search(instance, GOAL_STATE, stats)
+    elapsed = time.perf_counter() - t0
+
+    peak = None
+    if profile_memory:
+        tracemalloc.start()
+        search(instance, GOAL_STATE, {})
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "algorithm": algorithm,
+        "depth": depth,
+        "seed": seed,
+        "moves": len(path) - 1 if path else None,
+        "time_s": elapsed,
+        "memory_mb": peak / 1024 / 1024 if peak is not None else None,
+        "expanded": stats.get('expanded'),
+    }
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(runs):
+    """Group raw runs by (algorithm, depth) and compute mean/median/p95 per metric."""
+    groups = {}
+    for run in runs:
+        groups.setdefault((run["algorithm"], run["depth"]), []).append(run)
+    rows = []
+    for (algorithm, depth), group in sorted(groups.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+        row = {"algorithm": algorithm, "depth": depth, "instances": len(group)}
+        for metric in METRICS:
+            values = [r[metric] for r in group if r[metric] is not None]
+            if not values:
+                continue
+            row[f"{metric}_mean"] = statistics.mean(values)
+            row[f"{metric}_median"] = statistics.median(values)
+            row[f"{metric}_p95"] = percentile(values, 95)
+        rows.append(row)
+    return rows
+
+
+def run_benchmark(depths, k, algorithms, seed=0, workers=None, profile_memory=True):
+    get_database()  # build the distance table once before the workers need it
+    jobs = [(algorithm, depth, seed * 1_000_003 + depth * 10_007 + i, profile_memory)
+            for depth in depths for i in range(k) for algorithm in algorithms]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        runs = list(pool.map(run_job, jobs, chunksize=max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))))
+    return runs, summarize(runs)
+
+
+def write_outputs(summary, runs, prefix=OUT_PREFIX):
+    fields = ["algorithm", "depth", "instances"] + [f"{m}_{s}" for m in METRICS for s in ("mean", "median", "p95")]
+    with open(prefix + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(summary)
+    with open(prefix + ".json", "w") as f:
+        json.dump({"summary": summary, "runs": runs}, f, indent=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seeded multi-process 8-puzzle benchmark")
+    parser.add_argument("--depths", type=int, nargs="+", default=[6, 8, 10, 13, 15, 17, 20, 25, 31])
+    parser.add_argument("--k", type=int, default=20, help="Instances per depth")
+    parser.add_argument("--algos", type=str, default=",".join(SEARCHES),
+                        help="comma-separated: " + ", ".join(SEARCHES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc runs")
+    parser.add_argument("--out", type=str, default=OUT_PREFIX, help="Output path prefix (.csv/.json added)")
+    args = parser.parse_args()
+
+    algorithms = [a.strip() for a in args.algos.split(",") if a.strip()]
+    for a in algorithms:
+        if a not in SEARCHES:
+            parser.error(f"unknown algorithm {a!r}")
+    start = time.perf_counter()
+    runs, summary = run_benchmark(args.depths, args.k, algorithms, args.seed,
+                                  args.workers, not args.no_memory)
+    write_outputs(summary, runs, args.out)
+
+    print(f"{'Depth':<6} {'Algorithm':<10} {'Time mean':<10} {'median':<9} {'p95':<9} "
+          f"{'Mem MB p95':<11} {'Expanded median'}")
+    print("-" * 72)
+    for row in summary:
+        mem = row.get("memory_mb_p95")
+        print(f"{row['depth']:<6} {row['algorithm']:<10} {row['time_s_mean']:<10.4f} "
+              f"{row['time_s_median']:<9.4f} {row['time_s_p95']:<9.4f} "
+              f"{'-' if mem is None else f'{mem:.2f}':<11} {row['expanded_median']}")
+    print(f"\n{len(runs)} runs in {time.perf_counter() - start:.1f}s -> {args.out}.csv / .json")
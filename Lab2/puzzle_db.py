@@ -0,0 +1,253 @@
+"""
+Complete 8-puzzle distance database.
+
+A retrograde BFS from GOAL_STATE stores every reachable state's optimal
+distance in one byte, indexed by
+
+    index = blank_position * 20160 + rank(tiles 1..8 in reading order) // 2
+
+Only even tile permutations are reachable on a 3x3 board, and halving the
+Lehmer rank maps them onto 0..20159, so the table is exactly
+9 * 8! / 2 = 181,440 bytes. It is written once to disk and memory-mapped
+on later runs; solving is then a greedy descent with O(1) lookups.
+
+The same table yields the BFS layers: grouping indices by distance gives
+every state whose optimal depth is exactly d, so benchmark instances can
+be sampled uniformly at a true depth instead of by random walk.
+"""
+import argparse
+import mmap
+import os
+import random
+import time
+from array import array
+from collections import deque
+from math import factorial
+
+from puzzle import GOAL_STATE
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle8_dist.bin")
+HALF_PERMS = factorial(8) // 2
+DB_SIZE = 9 * HALF_PERMS
+UNREACHABLE = 255
+
+# Neighbouring cells of each blank position
+NEIGHBOURS = [[r * 3 + c for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+               if 0 <= r < 3 and 0 <= c < 3]
+              for row, col in (divmod(i, 3) for i in range(9))]
+FACT = [factorial(7 - i) for i in range(8)]
+
+
+# ---------------- Ranking ----------------
+def state_index(state):
+    """
+    Index of a state (list/tuple, 0 = blank) in the distance table.
+    Only meaningful for solvable states; see solvable().
+    """
+    blank = 0
+    rank = 0
+    i = 0
+    for pos, tile in enumerate(state):
+        if tile == 0:
+            blank = pos
+            continue
+        # Lehmer digit: tiles after this one that are smaller
+        smaller = 0
+        for later in state[pos + 1:]:
+            if 0 < later < tile:
+                smaller += 1
+        rank += smaller * FACT[i]
+        i += 1
+    return blank * HALF_PERMS + rank // 2
+
+
+def index_state(index):
+    """Inverse of state_index."""
+    blank, half = divmod(index, HALF_PERMS)
+    remaining = list(range(1, 9))
+    tiles = []
+    rank = half * 2
+    for i in range(8):
+        digit, rank = divmod(rank, FACT[i])
+        tiles.append(remaining.pop(digit))
+    if not is_even(tiles):
+        # the odd bit of the rank only swaps the last two tiles
+        tiles[6], tiles[7] = tiles[7], tiles[6]
+    tiles.insert(blank, 0)
+    return tiles
+
+
+def is_even(tiles):
+    """True if the tiles (blank excluded) form an even permutation."""
+    inversions = sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles))
+                     if tiles[i] > tiles[j])
+    return inversions % 2 == 0
+
+
+def solvable(state):
+    return is_even([t for t in state if t != 0])
+
+
+# ---------------- Build / load ----------------
+def build_database(path=DB_PATH):
+    """Retrograde BFS from GOAL_STATE; writes the distance table to `path`."""
+    dist = bytearray([UNREACHABLE]) * DB_SIZE
+    goal = tuple(GOAL_STATE)
+    dist[state_index(goal)] = 0
+    queue = deque([(goal, goal.index(0), 0)])
+    while queue:
+        state, blank, d = queue.popleft()
+        for nb in NEIGHBOURS[blank]:
+            child = list(state)
+            child[blank], child[nb] = child[nb], 0
+            idx = state_index(child)
+            if dist[idx] == UNREACHABLE:
+                dist[idx] = d + 1
+                queue.append((tuple(child), nb, d + 1))
+    with open(path, "wb") as f:
+        f.write(dist)
+    return dist
+
+
+def load_database(path=DB_PATH):
+    """Memory-map the distance table, building it first if it does not exist."""
+    if not os.path.exists(path) or os.path.getsize(path) != DB_SIZE:
+        build_database(path)
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+_db = None
+
+def get_database():
+    global _db
+    if _db is None:
+        _db = load_database()
+    return _db
+
+
+# ---------------- Solving ----------------
+def distance(state, db=None):
+    """Optimal number of moves to GOAL_STATE, or None if unsolvable."""
+    if not solvable(state):
+        return None
+    db = db if db is not None else get_database()
+    return db[state_index(state)]
+
+
+def db_search(initial_state, goal_state=GOAL_STATE, stats=None, db=None):
+    """
+    Optimal path by greedy descent: from each state step to any neighbour
+    one move closer to the goal. Same return value as graph_search.
+    """
+    if list(goal_state) != GOAL_STATE:
+        raise ValueError("the distance database is built for GOAL_STATE")
+    if not solvable(initial_state):
+        return None
+    db = db if db is not None else get_database()
+    state = list(initial_state)
+    d = db[state_index(state)]
+    path = [state]
+    lookups = 1
+    while d > 0:
+        blank = state.index(0)
+        for nb in NEIGHBOURS[blank]:
+            child = state[:]
+            child[blank], child[nb] = child[nb], 0
+            lookups += 1
+            if db[state_index(child)] == d - 1:
+                state, d = child, d - 1
+                path.append(state)
+                break
+    if stats is not None:
+        stats['expanded'] = lookups
+    return path
+
+
+# ---------------- Exact-depth instances ----------------
+_layers = None
+
+def depth_layers(db=None):
+    """
+    All reachable state indices grouped by optimal depth, built in one
+    counting-sort pass over the table: (order, offsets) where layer d is
+    order[offsets[d]:offsets[d + 1]]. Costs 4 bytes per state.
+    """
+    global _layers
+    if db is None and _layers is not None:
+        return _layers
+    table = (db if db is not None else get_database())[:]
+    counts = [0] * 256
+    for d in table:
+        counts[d] += 1
+    max_depth = max(d for d in range(UNREACHABLE) if counts[d])
+    offsets = [0] * (max_depth + 2)
+    for d in range(max_depth + 1):
+        offsets[d + 1] = offsets[d] + counts[d]
+    order = array('I', bytes(4 * offsets[-1]))
+    fill = offsets[:-1]
+    for idx, d in enumerate(table):
+        if d != UNREACHABLE:
+            order[fill[d]] = idx
+            fill[d] += 1
+    if db is None:
+        _layers = (order, offsets)
+    return order, offsets
+
+
+def max_depth():
+    return len(depth_layers()[1]) - 2
+
+
+def sample_at_depth(d, k=1, rng=random, unique=False):
+    """
+    k states drawn uniformly from those whose optimal distance is exactly d.
+    With unique=True no state repeats (k is capped at the layer size).
+    """
+    order, offsets = depth_layers()
+    if not 0 <= d < len(offsets) - 1:
+        raise ValueError(f"no 8-puzzle states at depth {d} (max {len(offsets) - 2})")
+    lo, hi = offsets[d], offsets[d + 1]
+    if unique:
+        picks = rng.sample(range(lo, hi), min(k, hi - lo))
+    else:
+        picks = [rng.randrange(lo, hi) for _ in range(k)]
+    return [index_state(order[i]) for i in picks]
+
+
+def generate_puzzle_at_exact_depth(d, rng=random):
+    """Uniformly random instance whose optimal solution has exactly d moves."""
+    return sample_at_depth(d, 1, rng)[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="8-puzzle complete distance database")
+    parser.add_argument("--build", action="store_true", help="(Re)build the table on disk")
+    parser.add_argument("--solve", type=int, nargs=9, metavar="T",
+                        help="Solve a state given as 9 tiles in reading order (0 = blank)")
+    parser.add_argument("--sample", type=int, nargs=2, metavar=("DEPTH", "K"),
+                        help="Print K uniformly sampled instances of exact optimal depth DEPTH")
+    args = parser.parse_args()
+
+    if args.build or not os.path.exists(DB_PATH):
+        t0 = time.perf_counter()
+        table = build_database()
+        print(f"Built {DB_PATH} ({len(table)} bytes) in {time.perf_counter() - t0:.2f}s")
+    db = get_database()
+    if args.sample:
+        depth, k = args.sample
+        for state in sample_at_depth(depth, k):
+            print(" ".join(map(str, state)))
+    elif args.solve:
+        path = db_search(args.solve, GOAL_STATE)
+        if path is None:
+            print("Unsolvable state")
+        else:
+            print("Solution found in", len(path) - 1, "moves:")
+            for step in path:
+                print(step)
+    else:
+        order, offsets = depth_layers(db)
+        print(f"{'Depth':<6} {'States'}")
+        for d in range(len(offsets) - 1):
+            print(f"{d:<6} {offsets[d + 1] - offsets[d]}")
@@ -0,0 +1,269 @@
+"""
+IDA* for the 15-puzzle with additive disjoint pattern databases.
+
+The tiles 1..15 are split into disjoint groups (default 5-5-5). For each
+group a database stores, for every placement of its tiles, the minimum
+number of moves *of those tiles* needed to reach their goal cells; the
+blank may wander through the other cells for free. Because no move is
+counted in two groups, the lookups add up to an admissible heuristic.
+
+A placement of k tiles on 16 cells is ranked in mixed radix
+16 * 15 * ... * (16 - k + 1), giving one byte per placement. Each
+database is built once by a layered BFS from the goal and written next
+to this file; later runs memory-map it.
+
+A 7-8 split would need 16!/8! (~519M) entries for the larger group,
+far too many to build in pure Python, so the default is 5-5-5
+(3 x 524,160 bytes). 6-6-3 is a stronger option that takes a few
+minutes to build.
+"""
+import argparse
+import mmap
+import os
+import random
+import time
+
+from puzzle import make_goal
+
+WIDTH = 4
+CELLS = WIDTH * WIDTH
+FULL = (1 << CELLS) - 1
+GOAL = make_goal(WIDTH)
+DEFAULT_SPLIT = ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15))
+PDB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+NEIGHBOURS = [[r * WIDTH + c for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+               if 0 <= r < WIDTH and 0 <= c < WIDTH]
+              for row, col in (divmod(i, WIDTH) for i in range(CELLS))]
+NEIGHBOUR_MASK = [sum(1 << q for q in nbs) for nbs in NEIGHBOURS]
+NOT_FIRST_COL = FULL & ~sum(1 << (r * WIDTH) for r in range(WIDTH))
+NOT_LAST_COL = FULL & ~sum(1 << (r * WIDTH + WIDTH - 1) for r in range(WIDTH))
+
+
+# ---------------- Ranking ----------------
+def placements(k):
+    """Number of ways to place k distinct tiles on the board."""
+    total = 1
+    for i in range(k):
+        total *= CELLS - i
+    return total
+
+
+def rank_placement(cells):
+    """Mixed-radix rank of a sequence of distinct cells."""
+    used = 0
+    index = 0
+    for i, p in enumerate(cells):
+        index = index * (CELLS - i) + p - (used & ((1 << p) - 1)).bit_count()
+        used |= 1 << p
+    return index
+
+
+def blank_region(blank, free):
+    """All cells the blank can reach through `free` cells (bitmask flood fill)."""
+    region = 1 << blank
+    while True:
+        grown = region | (((region << 1) & NOT_FIRST_COL) | ((region >> 1) & NOT_LAST_COL)
+                          | (region << WIDTH) | (region >> WIDTH)) & free
+        if grown == region:
+            return region
+        region = grown
+
+
+# ---------------- Database construction ----------------
+def pdb_path(tiles):
+    return os.path.join(PDB_DIR, "puzzle15_pdb_" + "-".join(map(str, tiles)) + ".bin")
+
+
+def build_pdb(tiles, path=None):
+    """
+    Layered BFS from the goal over (placement of `tiles`, blank region).
+    Only moves of pattern tiles cost 1; the blank's position inside its
+    free region is irrelevant, so each region is one abstract state.
+    """
+    k = len(tiles)
+    size = placements(k)
+    pdb = bytearray([255]) * size
+    seen = bytearray(size * CELLS)   # (placement, lowest cell of blank region)
+
+    start = tuple(t - 1 for t in tiles)
+    occupied = sum(1 << p for p in start)
+    region = blank_region(CELLS - 1, FULL & ~occupied)
+    idx = rank_placement(start)
+    pdb[idx] = 0
+    seen[idx * CELLS + (region & -region).bit_length() - 1] = 1
+    layer = [(start, occupied, region)]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for cells, occupied, region in layer:
+            for i, p in enumerate(cells):
+                targets = NEIGHBOUR_MASK[p] & region
+                while targets:
+                    low = targets & -targets
+                    targets ^= low
+                    q = low.bit_length() - 1
+                    moved = cells[:i] + (q,) + cells[i + 1:]
+                    new_occupied = occupied ^ (1 << p) ^ low
+                    new_region = blank_region(p, FULL & ~new_occupied)
+                    idx = rank_placement(moved)
+                    key = idx * CELLS + (new_region & -new_region).bit_length() - 1
+                    if seen[key]:
+                        continue
+                    seen[key] = 1
+                    if pdb[idx] == 255:
+                        pdb[idx] = depth
+                    next_layer.append((moved, new_occupied, new_region))
+        layer = next_layer
+
+    with open(path or pdb_path(tiles), "wb") as f:
+        f.write(pdb)
+    return pdb
+
+
+def load_pdb(tiles):
+    """Memory-map the database for `tiles`, building it on first use."""
+    path = pdb_path(tiles)
+    if not os.path.exists(path) or os.path.getsize(path) != placements(len(tiles)):
+        t0 = time.perf_counter()
+        build_pdb(tiles, path)
+        print(f"Built {os.path.basename(path)} in {time.perf_counter() - t0:.1f}s")
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# ---------------- IDA* ----------------
+class PDBHeuristic:
+    def __init__(self, split=DEFAULT_SPLIT):
+        tiles = sorted(t for group in split for t in group)
+        if tiles != list(range(1, CELLS)):
+            raise ValueError("the split must cover tiles 1..%d exactly once" % (CELLS - 1))
+        self.split = [tuple(group) for group in split]
+        self.tables = [load_pdb(group) for group in self.split]
+        self.group_of = [None] * CELLS
+        for g, group in enumerate(self.split):
+            for t in group:
+                self.group_of[t] = g
+
+    def group_value(self, g, pos):
+        return self.tables[g][rank_placement([pos[t] for t in self.split[g]])]
+
+    def parts(self, pos):
+        return [self.group_value(g, pos) for g in range(len(self.split))]
+
+
+def solvable(state):
+    """Inversion parity plus blank row (counted from the bottom) must be odd on a 4x4 board."""
+    tiles = [t for t in state if t != 0]
+    inversions = sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles))
+                     if tiles[i] > tiles[j])
+    blank_row_from_bottom = WIDTH - state.index(0) // WIDTH
+    return (inversions + blank_row_from_bottom) % 2 == 1
+
+
+def ida_star(initial_state, heuristic=None, stats=None):
+    """
+    IDA* from `initial_state` to the 4x4 goal. Returns the list of states
+    (start -> goal) like graph_search, or None if unsolvable.
+    Only the group of the moved tile is looked up again after each move.
+    """
+    if not solvable(initial_state):
+        return None
+    heuristic = heuristic or PDBHeuristic()
+    board = list(initial_state)
+    pos = [0] * CELLS
+    for cell, tile in enumerate(board):
+        pos[tile] = cell
+    parts = heuristic.parts(pos)
+    group_of = heuristic.group_of
+    moves = []          # blank cells visited, for path reconstruction
+    expanded = 0
+
+    def dfs(g, h, blank, prev, bound):
+        nonlocal expanded
+        if h == 0:
+            return True
+        expanded += 1
+        next_bound = None
+        for nb in NEIGHBOURS[blank]:
+            if nb == prev:
+                continue
+            tile = board[nb]
+            grp = group_of[tile]
+            old = parts[grp]
+            board[blank], board[nb] = tile, 0
+            pos[tile] = blank
+            new = heuristic.group_value(grp, pos)
+            f = g + 1 + h - old + new
+            if f <= bound:
+                parts[grp] = new
+                moves.append(nb)
+                found = dfs(g + 1, h - old + new, nb, blank, bound)
+                if found is True:
+                    return True
+                moves.pop()
+                parts[grp] = old
+            else:
+                found = f
+            if found is not None and found is not True and (next_bound is None or found < next_bound):
+                next_bound = found
+            board[nb], board[blank] = tile, 0
+            pos[tile] = nb
+        return next_bound
+
+    h0 = sum(parts)
+    bound = h0
+    start_blank = board.index(0)
+    while True:
+        result = dfs(0, h0, start_blank, -1, bound)
+        if result is True:
+            break
+        bound = result
+
+    if stats is not None:
+        stats['expanded'] = expanded
+    state = list(initial_state)
+    path = [state]
+    blank = start_blank
+    for nb in moves:
+        state = state[:]
+        state[blank], state[nb] = state[nb], 0
+        blank = nb
+        path.append(state)
+    return path
+
+
+def random_instance(rng=random):
+    """Uniformly random solvable 15-puzzle state."""
+    while True:
+        state = list(range(CELLS))
+        rng.shuffle(state)
+        if solvable(state):
+            return state
+
+
+def parse_split(text):
+    return tuple(tuple(int(t) for t in group.split(",")) for group in text.split("/"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="15-puzzle IDA* with additive pattern databases")
+    parser.add_argument("--instances", type=int, default=5, help="Random instances to solve")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--split", type=parse_split, default=DEFAULT_SPLIT,
+                        help="Tile groups, e.g. '1,2,3,5,6,9/4,7,8,11,12,15/10,13,14'")
+    args = parser.parse_args()
+
+    heuristic = PDBHeuristic(args.split)
+    rng = random.Random(args.seed)
+    print(f"{'#':<4} {'Moves':<6} {'Expanded':<11} {'Time (s)':<10} {'Nodes/s'}")
+    print("-" * 44)
+    for i in range(args.instances):
+        instance = random_instance(rng)
+        stats = {}
+        t0 = time.perf_counter()
+        path = ida_star(instance, heuristic, stats)
+        elapsed = time.perf_counter() - t0
+        print(f"{i:<4} {len(path) - 1:<6} {stats['expanded']:<11} {elapsed:<10.2f} "
+              f"{stats['expanded'] / max(elapsed, 1e-9):.0f}")
@@ -0,0 +1,116 @@
+"""
+Vectorized clause evaluation: score many assignments in one NumPy pass.
+
+The formula is stored as an (m x k) int32 matrix of variable indices plus
+an (m x k) matrix of literal signs. A batch of B assignments is a (B x n)
+boolean matrix (column v-1 holds variable v); gathering it through the
+variable matrix gives a (B x m x k) array of literal values, and a clause
+is satisfied where any of its k literals matches its sign.
+
+Accepts clauses in either format used in this lab: signed ints
+(l31.py, ksat_generator.py) or (var, positive) pairs (ksat_solver.py).
+Needs NumPy; the solvers only use it when asked to (--vectorized).
+"""
+import argparse
+import random
+import time
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+
+class BatchEvaluator:
+    def __init__(self, clauses, n, max_cells=1 << 24):
+        if not _HAS_NUMPY:
+            raise ImportError("numpy not installed. pip install numpy")
+        self.n = n
+        self.m = len(clauses)
+        variables, signs = [], []
+        for clause in clauses:
+            if clause and isinstance(clause[0], tuple):
+                variables.append([v for v, pos in clause])
+                signs.append([pos for v, pos in clause])
+            else:
+                variables.append([abs(lit) for lit in clause])
+                signs.append([lit > 0 for lit in clause])
+        self.literals = np.array(variables, dtype=np.int32).reshape(self.m, -1) - 1
+        self.signs = np.array(signs, dtype=bool).reshape(self.m, -1)
+        # rows per chunk so the (rows x m x k) temporary stays below max_cells
+        self.chunk = max(1, max_cells // max(1, self.literals.size))
+
+    def pack(self, assignments):
+        """(B x n) bool matrix from a list of {var: bool} assignments."""
+        return np.array([[a[v] for v in range(1, self.n + 1)] for a in assignments], dtype=bool).reshape(-1, self.n)
+
+    def satisfied_counts(self, matrix):
+        """Number of satisfied clauses for every row of a (B x n) bool matrix."""
+        matrix = np.asarray(matrix, dtype=bool)
+        out = np.empty(len(matrix), dtype=np.int64)
+        for lo in range(0, len(matrix), self.chunk):
+            block = matrix[lo:lo + self.chunk]
+            values = block[:, self.literals]            # (rows, m, k)
+            out[lo:lo + self.chunk] = (values == self.signs).any(axis=2).sum(axis=1)
+        return out
+
+    def flip_neighbours(self, row):
+        """(n x n) matrix whose row v-1 is `row` with variable v flipped."""
+        neighbours = np.tile(np.asarray(row, dtype=bool), (self.n, 1))
+        diagonal = np.arange(self.n)
+        neighbours[diagonal, diagonal] ^= True
+        return neighbours
+
+    def neighbourhoods(self, rows):
+        """(B(n+1) x n) matrix: each of the B rows followed by its n flip neighbours."""
+        rows = np.asarray(rows, dtype=bool).reshape(-1, self.n)
+        batch = np.repeat(rows[:, None, :], self.n + 1, axis=1)     # (B, n+1, n)
+        diagonal = np.arange(self.n)
+        batch[:, diagonal + 1, diagonal] ^= True
+        return batch.reshape(-1, self.n)
+
+
+def benchmark(n, m, k=3, batch=500, seed=0):
+    """Pure-Python evaluate() vs one batched pass, then beam search with and without it."""
+    from ksat_solver import beam_search, evaluate, generate_k_sat
+
+    random.seed(seed)
+    clauses = generate_k_sat(k, n, m)
+    assignments = [{i: random.choice([True, False]) for i in range(1, n + 1)} for _ in range(batch)]
+    evaluator = BatchEvaluator(clauses, n)
+
+    start = time.perf_counter()
+    expected = [evaluate(clauses, a) for a in assignments]
+    t_python = time.perf_counter() - start
+    matrix = evaluator.pack(assignments)
+    start = time.perf_counter()
+    counts = evaluator.satisfied_counts(matrix)
+    t_numpy = time.perf_counter() - start
+    assert counts.tolist() == expected
+    print(f"Scoring {batch} assignments (n={n}, m={m}): python {t_python:.3f}s | "
+          f"numpy {t_numpy:.4f}s | {t_python / t_numpy:.1f}x")
+
+    print(f"\n{'Beam width':<11} {'Python (s)':<11} {'NumPy (s)':<10} {'Speedup':<8} Score")
+    print("-" * 50)
+    for width in (3, 4):
+        times, scores = [], []
+        for vectorized in (False, True):
+            random.seed(seed)
+            start = time.perf_counter()
+            scores.append(beam_search(clauses, n, beam_width=width, max_iters=20, vectorized=vectorized))
+            times.append(time.perf_counter() - start)
+        assert scores[0] == scores[1]
+        speedup = f"{times[0] / times[1]:.1f}x"
+        print(f"{width:<11} {times[0]:<11.3f} {times[1]:<10.3f} {speedup:<8} {scores[0]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched NumPy clause evaluation")
+    parser.add_argument("--n", type=int, default=100)
+    parser.add_argument("--m", type=int, default=426)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=500, help="Assignments scored at once")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark(args.n, args.m, args.k, args.batch, args.seed)
@@ -70,8 +70,14 @@ def evaluate(clauses, assignment):
 def heuristic1(clauses, assignment):
     return evaluate(clauses, assignment)  # clause satisfaction count
 
-def heuristic2(clauses, assignment):
+def heuristic2(clauses, assignment, evaluator=None):
     # make-break heuristic (net gain of flipping best variable)
+    if evaluator is not None:
+        # all single flips scored in one batch (batch_eval.BatchEvaluator)
+        row = evaluator.pack([assignment])[0]
+        current = int(evaluator.satisfied_counts(row[None, :])[0])
+        gains = evaluator.satisfied_counts(evaluator.flip_neighbours(row)) - current
+        return current + max([-len(clauses)] + gains.tolist())
     current = evaluate(clauses, assignment)
     best_gain = -len(clauses)
     for v in assignment:
@@ -106,8 +112,10 @@ def hill_climbing(clauses, n, max_iters=1000, restarts=5):
                 break
     return best_score
 
-def beam_search(clauses, n, beam_width=3, max_iters=100):
+def beam_search(clauses, n, beam_width=3, max_iters=100, vectorized=False):
     beam = [{i: random.choice([True, False]) for i in range(1, n + 1)} for _ in range(beam_width)]
+    if vectorized:
+        return beam_search_batched(clauses, n, beam, max_iters)
     best_score = -1
     for _ in range(max_iters):
         new_beam = []
@@ -125,6 +133,23 @@ def beam_search(clauses, n, beam_width=3, max_iters=100):
         beam = [s[1] for s in scored[:beam_width]]
     return best_score
 
+def beam_search_batched(clauses, n, beam, max_iters=100):
+    # Same search as beam_search, but each member and its n flip neighbours
+    # are scored in one NumPy pass and only the kept rows are copied.
+    from batch_eval import BatchEvaluator
+    evaluator = BatchEvaluator(clauses, n)
+    beam_width = len(beam)
+    rows = evaluator.pack(beam)
+    best_score = -1
+    for _ in range(max_iters):
+        batch = evaluator.neighbourhoods(rows)
+        scores = evaluator.satisfied_counts(batch).tolist()
+        best_score = max(best_score, max(scores[::n + 1]))
+        # stable descending order, as scored.sort(reverse=True) in beam_search
+        keep = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:beam_width]
+        rows = batch[keep]
+    return best_score
+
 def variable_neighborhood_descent(clauses, n, max_iters=300):
     assignment = {i: random.choice([True, False]) for i in range(1, n + 1)}
     best_score = evaluate(clauses, assignment)
@@ -182,7 +207,7 @@ def variable_neighborhood_descent(clauses, n, max_iters=300):
 # -------------------------------
 # Experiment Runner
 # -------------------------------
-def run_experiment(n, m, trials, out_file):
+def run_experiment(n, m, trials, out_file, vectorized=False):
     k = 3
     results = []
     for t in range(trials):
@@ -193,11 +218,11 @@ def run_experiment(n, m, trials, out_file):
         hc_time = time.time() - start
 
         start = time.time()
-        bs3_score = beam_search(clauses, n, beam_width=3)
+        bs3_score = beam_search(clauses, n, beam_width=3, vectorized=vectorized)
         bs3_time = time.time() - start
 
         start = time.time()
-        bs4_score = beam_search(clauses, n, beam_width=4)
+        bs4_score = beam_search(clauses, n, beam_width=4, vectorized=vectorized)
         bs4_time = time.time() - start
 
         start = time.time()
@@ -225,8 +250,10 @@ if __name__ == "__main__":
     parser.add_argument("--m", type=int, required=True, help="Number of clauses")
     parser.add_argument("--trials", type=int, default=5, help="Number of trials")
     parser.add_argument("--out", type=str, default="results.csv", help="Output CSV filename")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Score beam neighbours in NumPy batches (see batch_eval.py)")
     args = parser.parse_args()
 
-    run_experiment(args.n, args.m, args.trials, args.out)
+    run_experiment(args.n, args.m, args.trials, args.out, args.vectorized)
     results_file = "results.csv"  # Path to the results CSV file
     calculate_statistics(results_file)
\ No newline at end of file
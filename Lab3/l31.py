@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 """
-Uniform random k-SAT generator and local-search solvers (Hill-Climbing, Beam Search, VND)
+Uniform random k-SAT generator and local-search solvers (Hill-Climbing, Beam Search, VND,
+WalkSAT, ProbSAT)
 Single-file experiment harness suitable for submission.
 
 Usage examples:
   python3 ksat_solver_experiment.py --k 3 --n 50 --m 210 --trials 30 --algos hc,beam3,beam4,vnd --out results.csv
+  python3 ksat_solver_experiment.py --k 3 --n 200 --m 852 --algos hc,walksat,probsat --noise 0.5 --cb 2.38
 
 Dependencies: only Python standard library.
 
-Output: CSV with per-trial results (score, penetrance, time) for each algorithm.
+Output: CSV with per-trial results (score, penetrance, time, flips, flips/sec,
+time to solution) for each algorithm. Columns an algorithm does not measure are empty.
 """
 
 import argparse
@@ -16,6 +19,7 @@ import csv
 import random
 import time
 import math
+from bisect import bisect_left, insort
 from collections import defaultdict
 
 # ------------------------ k-SAT generator ------------------------
@@ -110,6 +114,165 @@ def flip_effect_make_break(var, clauses, assignment, clause_counts, occ):
             brk += 1
     return make, brk
 
+class SatState:
+    """Incremental WalkSAT-style bookkeeping for one assignment.
+
+    Per clause: the number of true literals and the xor of their variables
+    (when exactly one literal is true, the xor *is* its variable). Per
+    variable: make (unsatisfied clauses it would fix) and break (clauses it
+    alone satisfies). The unsatisfied clauses are kept in a list with a
+    position index, so removal and uniform sampling are O(1).
+
+    flip(var) only visits the clauses containing var, so a step costs
+    O(occurrences * k) instead of rescanning the formula. With
+    buckets=True variables are also kept in sorted lists per make - break
+    value, so the best flips are found without looking at every variable.
+    Assumes the variables of a clause are distinct, as the generator makes them.
+    """
+
+    def __init__(self, clauses, n, assignment, occ=None, buckets=True):
+        self.clauses = clauses
+        self.n = n
+        self.assignment = assignment  # updated in place by flip()
+        occ = occ if occ is not None else build_occurrences(clauses, n)
+        # (clause index, literal is positive) per variable
+        self.occ_lits = [[]] + [[(ci, next(lit > 0 for lit in clauses[ci] if abs(lit) == var))
+                                 for ci in occ[var]] for var in range(1, n+1)]
+        self.clause_vars = [[abs(lit) for lit in c] for c in clauses]
+        m = len(clauses)
+        self.true_count = [0]*m
+        self.true_xor = [0]*m
+        self.make = [0]*(n+1)
+        self.brk = [0]*(n+1)
+        self.unsat = []
+        self.unsat_pos = [-1]*m
+        for ci, clause in enumerate(clauses):
+            for lit in clause:
+                var = abs(lit)
+                if assignment[var] == (lit > 0):
+                    self.true_count[ci] += 1
+                    self.true_xor[ci] ^= var
+            if self.true_count[ci] == 0:
+                self._add_unsat(ci)
+                for var in self.clause_vars[ci]:
+                    self.make[var] += 1
+            elif self.true_count[ci] == 1:
+                self.brk[self.true_xor[ci]] += 1
+        self.buckets = None
+        if buckets:
+            self.buckets = defaultdict(list)
+            self.gain = [0]*(n+1)
+            for var in range(1, n+1):
+                self.gain[var] = self.make[var] - self.brk[var]
+                self.buckets[self.gain[var]].append(var)
+
+    def copy(self):
+        """Independent copy; the formula and occurrence lists are shared."""
+        other = object.__new__(SatState)
+        other.__dict__.update(self.__dict__)
+        other.assignment = self.assignment.copy()
+        for name in ('true_count', 'true_xor', 'make', 'brk', 'unsat', 'unsat_pos'):
+            setattr(other, name, getattr(self, name)[:])
+        if self.buckets is not None:
+            other.gain = self.gain[:]
+            other.buckets = defaultdict(list, {g: vs[:] for g, vs in self.buckets.items()})
+        return other
+
+    @property
+    def score(self):
+        """Number of satisfied clauses."""
+        return len(self.clauses) - len(self.unsat)
+
+    def _add_unsat(self, ci):
+        self.unsat_pos[ci] = len(self.unsat)
+        self.unsat.append(ci)
+
+    def _remove_unsat(self, ci):
+        pos = self.unsat_pos[ci]
+        last = self.unsat.pop()
+        if last != ci:
+            self.unsat[pos] = last
+            self.unsat_pos[last] = pos
+        self.unsat_pos[ci] = -1
+
+    def flip(self, var):
+        """Flip var and update counts, make/break and the unsatisfied list."""
+        make, brk = self.make, self.brk
+        true_count, true_xor = self.true_count, self.true_xor
+        touched = [var]
+        new_val = not self.assignment[var]
+        self.assignment[var] = new_val
+        for ci, positive in self.occ_lits[var]:
+            if positive == new_val:
+                # literal becomes true
+                true_count[ci] += 1
+                true_xor[ci] ^= var
+                if true_count[ci] == 1:
+                    self._remove_unsat(ci)
+                    for u in self.clause_vars[ci]:
+                        make[u] -= 1
+                    touched.extend(self.clause_vars[ci])
+                    brk[var] += 1
+                elif true_count[ci] == 2:
+                    other = true_xor[ci] ^ var
+                    brk[other] -= 1
+                    touched.append(other)
+            else:
+                # literal becomes false
+                true_count[ci] -= 1
+                true_xor[ci] ^= var
+                if true_count[ci] == 0:
+                    self._add_unsat(ci)
+                    brk[var] -= 1
+                    for u in self.clause_vars[ci]:
+                        make[u] += 1
+                    touched.extend(self.clause_vars[ci])
+                elif true_count[ci] == 1:
+                    brk[true_xor[ci]] += 1
+                    touched.append(true_xor[ci])
+        if self.buckets is not None:
+            gain, buckets = self.gain, self.buckets
+            for u in touched:
+                g = make[u] - brk[u]
+                if g != gain[u]:
+                    bucket = buckets[gain[u]]
+                    del bucket[bisect_left(bucket, u)]
+                    if not bucket:
+                        del buckets[gain[u]]
+                    gain[u] = g
+                    insort(buckets[g], u)
+
+    def flip_delta(self, variables):
+        """Change in satisfied clauses if all of `variables` (distinct) were flipped together.
+
+        The sum of the single-flip gains is exact except on clauses holding
+        two or more of the variables; those are corrected from their true
+        counts. Nothing is modified.
+        """
+        make, brk, assignment = self.make, self.brk, self.assignment
+        delta = 0
+        shifts = {}
+        for var in variables:
+            delta += make[var] - brk[var]
+            for ci, positive in self.occ_lits[var]:
+                shifts.setdefault(ci, []).append(-1 if positive == assignment[var] else 1)
+        for ci, ds in shifts.items():
+            if len(ds) > 1:
+                c = self.true_count[ci]
+                was = c > 0
+                exact = (c + sum(ds) > 0) - was
+                singles = sum((c + d > 0) - was for d in ds)
+                delta += exact - singles
+        return delta
+
+    def best_flips(self):
+        """(best make - break, variables reaching it in increasing order); needs buckets=True.
+        The list is the live bucket: read it, do not modify it."""
+        if not self.buckets:
+            return None, []
+        best = max(self.buckets)
+        return best, self.buckets[best]
+
 # ------------------------ Hill-Climbing ------------------------
 
 def hill_climbing(clauses, n, max_iters=10000, restarts=20, seed=None, allow_sideways=False):
@@ -119,27 +282,17 @@ def hill_climbing(clauses, n, max_iters=10000, restarts=20, seed=None, allow_sid
     best_global = None
     best_score = -1
     stats = {'restarts': 0, 'flips': 0}
+    time_to_solution = None
     start_time = time.time()
     for r in range(restarts):
         stats['restarts'] += 1
         assignment = random_assignment(n)
-        clause_counts = initial_clause_true_counts(clauses, assignment)
-        current_score = score_assignment(clauses, assignment)
+        state = SatState(clauses, n, assignment, occ)
         iters = 0
         while iters < max_iters:
             iters += 1
             stats['flips'] += 1
-            best_var = None
-            best_val = -10**9
-            tie_vars = []
-            for var in range(1, n+1):
-                make, brk = flip_effect_make_break(var, clauses, assignment, clause_counts, occ)
-                val = make - brk
-                if val > best_val:
-                    best_val = val
-                    tie_vars = [var]
-                elif val == best_val:
-                    tie_vars.append(var)
+            best_val, tie_vars = state.best_flips()
             if not tie_vars:
                 break
             # choose variable (tie break random)
@@ -147,80 +300,84 @@ def hill_climbing(clauses, n, max_iters=10000, restarts=20, seed=None, allow_sid
             # if best_val < 0, no improving flip
             if best_val < 0 or (best_val == 0 and not allow_sideways):
                 break
-            # apply flip
-            assignment[best_var] = not assignment[best_var]
-            # update clause_counts (recompute affected clauses for clarity)
-            for ci in occ[best_var]:
-                cnt = 0
-                for lit in clauses[ci]:
-                    varr = abs(lit)
-                    val = assignment[varr]
-                    if lit < 0:
-                        val = not val
-                    if val:
-                        cnt += 1
-                clause_counts[ci] = cnt
-            current_score = score_assignment(clauses, assignment)
+            # apply flip; only the clauses containing best_var are revisited
+            state.flip(best_var)
+            current_score = state.score
             if current_score > best_score:
                 best_score = current_score
                 best_global = dict(assignment)
             if best_score == len(clauses):
+                if time_to_solution is None:
+                    time_to_solution = time.time() - start_time
                 break
     total_time = time.time() - start_time
-    return best_global, best_score, {'time': total_time, 'flips': stats['flips']}
+    return best_global, best_score, {'time': total_time, 'flips': stats['flips'],
+                                     'time_to_solution': time_to_solution}
 
 # ------------------------ Beam Search (complete-assignment beam over flips) ------------------------
 
+def assignment_mask(assignment, n):
+    """Assignment as an int with bit v set when variable v is True."""
+    mask = 0
+    for var in range(1, n+1):
+        if assignment[var]:
+            mask |= 1 << var
+    return mask
+
+
 def beam_search(clauses, n, beam_width=3, max_iters=1000, seed=None):
+    """Beam of complete assignments, expanded by all single flips.
+
+    Members are (score, bitmask, SatState). A neighbour is only a bitmask
+    and a score, s + make - break of the flipped variable, so nothing is
+    copied or rescored while expanding; only the top beam_width neighbours
+    get their own state (a copy of the parent plus one flip).
+    """
     if seed is not None:
         random.seed(seed)
     start_time = time.time()
+    occ = build_occurrences(clauses, n)
     # initial beam: unique random assignments
     beam = []
     seen = set()
     while len(beam) < beam_width:
         a = random_assignment(n)
-        key = tuple(sorted(a.items()))
+        key = assignment_mask(a, n)
         if key in seen:
             continue
         seen.add(key)
-        s = score_assignment(clauses, a)
-        beam.append((s, a))
+        state = SatState(clauses, n, a, occ, buckets=False)
+        beam.append((state.score, key, state))
     beam.sort(reverse=True, key=lambda x: x[0])
     iters = 0
     while iters < max_iters:
         iters += 1
         candidates = []
         cand_keys = set()
-        for s, a in beam:
+        for s, mask, state in beam:
+            make, brk = state.make, state.brk
             for var in range(1, n+1):
-                new_a = dict(a)
-                new_a[var] = not new_a[var]
-                key = tuple(sorted(new_a.items()))
+                key = mask ^ (1 << var)
                 if key in cand_keys:
                     continue
                 cand_keys.add(key)
-                s_new = score_assignment(clauses, new_a)
-                candidates.append((s_new, new_a))
+                candidates.append((s + make[var] - brk[var], key, state, var))
         if not candidates:
             break
+        # stable sort: equal scores keep generation order, as before
         candidates.sort(reverse=True, key=lambda x: x[0])
-        new_beam = []
-        new_keys = set()
-        for s_new, new_a in candidates:
-            key = tuple(sorted(new_a.items()))
-            if key in new_keys:
-                continue
-            new_beam.append((s_new, new_a))
-            new_keys.add(key)
-            if len(new_beam) >= beam_width:
-                break
-        beam = new_beam
+        beam = []
+        for s_new, key, parent, var in candidates[:beam_width]:
+            state = parent.copy()
+            state.flip(var)
+            beam.append((s_new, key, state))
         # check solution
-        for s, a in beam:
+        for s, mask, state in beam:
             if s == len(clauses):
-                return a, s, {'time': time.time()-start_time, 'iters': iters}
-    return beam[0][1], beam[0][0], {'time': time.time()-start_time, 'iters': iters}
+                elapsed = time.time()-start_time
+                return state.assignment, s, {'time': elapsed, 'iters': iters, 'time_to_solution': elapsed}
+    return beam[0][2].assignment, beam[0][0], {'time': time.time()-start_time, 'iters': iters,
+                                               'time_to_solution': None}
 
 # ------------------------ Variable-Neighborhood Descent (VND) ------------------------
 
@@ -229,26 +386,22 @@ def vnd(clauses, n, max_iters=5000, sample_pairs=200, sample_triples=500, seed=N
         random.seed(seed)
     start_time = time.time()
     assignment = random_assignment(n)
-    clause_counts = initial_clause_true_counts(clauses, assignment)
-    best_score = score_assignment(clauses, assignment)
+    # occurrence lists, clause counts and make/break are built once and updated per flip
+    state = SatState(clauses, n, assignment)
+    best_score = state.score
+    time_to_solution = 0.0 if best_score == len(clauses) else None
     iters = 0
     improved_overall = True
     vars_list = list(range(1, n+1))
     while iters < max_iters and improved_overall:
         improved_overall = False
-        # N1: best single flip
-        best_var = None
-        best_delta = 0
-        for var in vars_list:
-            make, brk = flip_effect_make_break(var, clauses, assignment, clause_counts, build_occurrences(clauses, n))
-            delta = make - brk
-            if delta > best_delta:
-                best_delta = delta
-                best_var = var
+        # N1: best single flip (lowest-numbered variable among the best)
+        best_delta = max(state.buckets) if state.buckets else 0
         if best_delta > 0:
-            assignment[best_var] = not assignment[best_var]
-            clause_counts = initial_clause_true_counts(clauses, assignment)
-            best_score = score_assignment(clauses, assignment)
+            state.flip(state.buckets[best_delta][0])
+            best_score = state.score
+            if best_score == len(clauses) and time_to_solution is None:
+                time_to_solution = time.time() - start_time
             improved_overall = True
             iters += 1
             continue
@@ -263,23 +416,16 @@ def vnd(clauses, n, max_iters=5000, sample_pairs=200, sample_triples=500, seed=N
             if key in tried:
                 continue
             tried.add(key)
-            # simulate
-            assignment[a] = not assignment[a]
-            assignment[b] = not assignment[b]
-            sc = score_assignment(clauses, assignment)
-            # revert
-            assignment[a] = not assignment[a]
-            assignment[b] = not assignment[b]
-            delta = sc - best_score
+            delta = state.flip_delta((a, b))
             if delta > best_pair_delta:
                 best_pair_delta = delta
                 best_pair = (a,b)
         if best_pair_delta > 0:
-            a,b = best_pair
-            assignment[a] = not assignment[a]
-            assignment[b] = not assignment[b]
-            clause_counts = initial_clause_true_counts(clauses, assignment)
-            best_score = score_assignment(clauses, assignment)
+            for v in best_pair:
+                state.flip(v)
+            best_score = state.score
+            if best_score == len(clauses) and time_to_solution is None:
+                time_to_solution = time.time() - start_time
             improved_overall = True
             iters += 1
             continue
@@ -293,31 +439,84 @@ def vnd(clauses, n, max_iters=5000, sample_pairs=200, sample_triples=500, seed=N
             if trio in tried3:
                 continue
             tried3.add(trio)
-            for v in trio:
-                assignment[v] = not assignment[v]
-            sc = score_assignment(clauses, assignment)
-            for v in trio:
-                assignment[v] = not assignment[v]
-            delta = sc - best_score
+            delta = state.flip_delta(trio)
             if delta > best_triple_delta:
                 best_triple_delta = delta
                 best_triple = trio
         if best_triple_delta > 0:
             for v in best_triple:
-                assignment[v] = not assignment[v]
-            clause_counts = initial_clause_true_counts(clauses, assignment)
-            best_score = score_assignment(clauses, assignment)
+                state.flip(v)
+            best_score = state.score
+            if best_score == len(clauses) and time_to_solution is None:
+                time_to_solution = time.time() - start_time
             improved_overall = True
             iters += 1
             continue
         # no improvement
         break
     total_time = time.time() - start_time
-    return assignment, best_score, {'time': total_time, 'iters': iters}
+    return assignment, best_score, {'time': total_time, 'iters': iters, 'time_to_solution': time_to_solution}
+
+# ------------------------ WalkSAT / ProbSAT ------------------------
+
+def _focused_search(clauses, n, max_flips, pick, seed, occ=None):
+    """Shared loop of the focused random walks: repeatedly choose a uniformly
+    random unsatisfied clause (O(1) from SatState.unsat) and flip the variable
+    pick(clause_vars, brk) returns. The best assignment is rebuilt at the end
+    by undoing the flips made after it, so it is never copied mid-run."""
+    if seed is not None:
+        random.seed(seed)
+    start_time = time.time()
+    assignment = random_assignment(n)
+    state = SatState(clauses, n, assignment, occ, buckets=False)
+    unsat, brk, clause_vars = state.unsat, state.brk, state.clause_vars
+    best_score = state.score
+    since_best = []
+    time_to_solution = 0.0 if not unsat else None
+    flips = 0
+    while unsat and flips < max_flips:
+        ci = unsat[random.randrange(len(unsat))]
+        var = pick(clause_vars[ci], brk)
+        state.flip(var)
+        flips += 1
+        since_best.append(var)
+        if len(clauses) - len(unsat) > best_score:
+            best_score = len(clauses) - len(unsat)
+            since_best = []
+            if not unsat:
+                time_to_solution = time.time() - start_time
+    best = dict(assignment)
+    for var in since_best:
+        best[var] = not best[var]
+    return best, best_score, {'time': time.time() - start_time, 'flips': flips,
+                              'time_to_solution': time_to_solution}
+
+
+def walksat(clauses, n, max_flips=100000, noise=0.5, seed=None):
+    """WalkSAT/SKC: flip a break-0 variable of the clause if there is one;
+    otherwise a random variable with probability `noise`, else a least-break one."""
+    def pick(variables, brk):
+        breaks = [brk[v] for v in variables]
+        least = min(breaks)
+        if least > 0 and random.random() < noise:
+            return random.choice(variables)
+        return random.choice([v for v, b in zip(variables, breaks) if b == least])
+    return _focused_search(clauses, n, max_flips, pick, seed)
+
+
+def probsat(clauses, n, max_flips=100000, cb=2.38, eps=1.0, seed=None):
+    """ProbSAT with the polynomial break function: a variable of the clause is
+    flipped with probability proportional to (eps + break)^-cb."""
+    occ = build_occurrences(clauses, n)
+    # break values never exceed a variable's occurrence count
+    weight = [(eps + b) ** -cb for b in range(max(map(len, occ.values()), default=0) + 1)]
+    def pick(variables, brk):
+        return random.choices(variables, [weight[brk[v]] for v in variables])[0]
+    return _focused_search(clauses, n, max_flips, pick, seed, occ)
 
 # ------------------------ Experiment harness and CLI ------------------------
 
-def run_trial(clauses, n, algo, seed=None):
+def run_trial(clauses, n, algo, seed=None, noise=0.5, cb=2.38):
     if algo == 'hc':
         a, s, st = hill_climbing(clauses, n, restarts=10, max_iters=2000, seed=seed)
     elif algo == 'beam3':
@@ -326,6 +525,11 @@ def run_trial(clauses, n, algo, seed=None):
         a, s, st = beam_search(clauses, n, beam_width=4, max_iters=1000, seed=seed)
     elif algo == 'vnd':
         a, s, st = vnd(clauses, n, max_iters=2000, seed=seed)
+    elif algo == 'walksat':
+        # same flip budget as hc (restarts * max_iters)
+        a, s, st = walksat(clauses, n, max_flips=20000, noise=noise, seed=seed)
+    elif algo == 'probsat':
+        a, s, st = probsat(clauses, n, max_flips=20000, cb=cb, seed=seed)
     else:
         raise ValueError('Unknown algorithm')
     return s, st
@@ -338,13 +542,16 @@ def main():
     parser.add_argument('--m', type=int, required=True)
     parser.add_argument('--trials', type=int, default=30)
     parser.add_argument('--algos', type=str, default='hc,beam3,beam4,vnd',
-                        help='comma-separated: hc, beam3, beam4, vnd')
+                        help='comma-separated: hc, beam3, beam4, vnd, walksat, probsat')
+    parser.add_argument('--noise', type=float, default=0.5, help='WalkSAT random-walk probability p')
+    parser.add_argument('--cb', type=float, default=2.38, help='ProbSAT break-polynomial exponent')
     parser.add_argument('--seed', type=int, default=0)
     parser.add_argument('--out', type=str, default='ksat_results.csv')
     args = parser.parse_args()
 
     algos = [a.strip() for a in args.algos.split(',') if a.strip()]
-    header = ['trial','n','m','algo','score','penetrance','time_seconds']
+    header = ['trial','n','m','algo','score','penetrance','time_seconds',
+              'flips','flips_per_sec','time_to_solution']
 
     with open(args.out, 'w', newline='') as csvfile:
         writer = csv.writer(csvfile)
@@ -353,9 +560,14 @@ def main():
             seed = args.seed + t
             clauses = gen_random_k_sat(args.k, args.m, args.n, seed=seed)
             for algo in algos:
-                s, st = run_trial(clauses, args.n, algo, seed=seed)
+                s, st = run_trial(clauses, args.n, algo, seed=seed, noise=args.noise, cb=args.cb)
                 penetrance = s / len(clauses)
-                writer.writerow([t, args.n, args.m, algo, s, f'{penetrance:.6f}', f'{st["time"]:.6f}'])
+                flips = st.get('flips')
+                rate = f'{flips / st["time"]:.1f}' if flips is not None and st['time'] > 0 else ''
+                tts = st.get('time_to_solution')
+                writer.writerow([t, args.n, args.m, algo, s, f'{penetrance:.6f}', f'{st["time"]:.6f}',
+                                 '' if flips is None else flips, rate,
+                                 '' if tts is None else f'{tts:.6f}'])
                 # flush occasionally
                 csvfile.flush()
     print(f'Results saved to {args.out}')